@@ -1,22 +1,83 @@
 import streamlit as st
 import json
 import os
+import sys
 import hashlib
+import functools
+import heapq
+import operator
 from datetime import datetime
 from typing import Dict, List, Any, Tuple, Optional
 from difflib import SequenceMatcher
 import re
+import unicodedata
 import pandas as pd
+from dateutil import parser as dtparser
 import shutil
 from pathlib import Path
 import zipfile
 import io
+import csv
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+try:
+    from rapidfuzz import fuzz, process
+    from rapidfuzz.distance import Indel
+except ImportError:
+    fuzz = process = Indel = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # ==========================
 # Helper Functions
 # ==========================
 
 AUDIO_EXTS = {".wav", ".mp3", ".m4a", ".flac", ".ogg", ".opus", ".aac"}
+AUDIO_EXT_SET = frozenset(e.lower() for e in AUDIO_EXTS)
+
+# Noyob ma'lumotlar to'plamiga chiqariladigan record maydonlari
+_BUNDLE_KEYS = ("utt_id", "text", "duration_ms", "speaker_id", "created_at", "sample_rate",
+                "bit_depth", "lang", "gender", "device", "region", "sentiment", "annotation",
+                "category", "source_file", "source_folder")
+
+# Ko'p recordlarda takrorlanadigan qisqa qiymatlar: xotirada bitta nusxa saqlanadi (sys.intern)
+_INTERNED_KEYS = ("category", "speaker_id", "source_folder", "lang")
+
+# O'xshashlik qidiruvida nomzod tanlash: uzun matnlar kamida shuncha umumiy so'zga ega bo'lishi kerak.
+# Qisqa matnlarda har bir xato bitta so'zni buzadi, shuning uchun yangi matn qisqa bo'lsa butun baza
+# taqqoslanadi, nomzod qisqa bo'lsa esa bitta umumiy so'z yetarli
+MIN_SHARED_TOKENS = 2
+SHORT_TEXT_TOKENS = 7
+
+# add_records_batch: bitta cdist blokidagi o'xshashlik matritsasi kataklari soni (xotira chegarasi)
+BATCH_MATRIX_CELLS = 4_000_000
+
+# Qo'shish/yangilashlar jurnalga yoziladi; shuncha yozuvdan keyin to'liq snapshot saqlanadi
+JOURNAL_SNAPSHOT_EVERY = 1000
+JOURNAL_BUFFER = 1 << 16
+
+# Statistika jadvallarida ko'rsatiladigan eng katta qatorlar soni
+TOP_DUPLICATE_GROUPS = 20
+TOP_DISTRIBUTION_ROWS = 100
+
+# text_hash algoritmi: bazadagi metadata["hash_algo"] bilan mos kelmasa, hashlar qayta hisoblanadi
+HASH_ALGO = "xxh3_64" if xxhash is not None else "sha256"
+
+# normalize_text uchun oldindan kompilyatsiya qilingan regexlar
+_PUNCT_RE = re.compile(r"[^\w\s''ʼ-]+", re.UNICODE)
+_WS_RE = re.compile(r"\s+")
+# ASCII matnlar uchun: _PUNCT_RE ushlaydigan har bir ASCII belgi bo'shliqqa almashtiriladi (str.translate)
+_ASCII_PUNCT_TABLE = str.maketrans({c: " " for c in map(chr, range(128)) if _PUNCT_RE.fullmatch(c)})
 
 
 def normalize_text(s: str, *, unique_word_signature: bool = False) -> str:
@@ -26,15 +87,18 @@ def normalize_text(s: str, *, unique_word_signature: bool = False) -> str:
     """
     if not s:
         return ""
-    # Unicode normalize
-    import unicodedata
-    s = unicodedata.normalize("NFKC", s)
-    # Lowercase
-    s = s.lower()
-    # Replace punctuation & symbols with space
-    s = re.sub(r"[^\w\s''ʼ-]+", " ", s, flags=re.UNICODE)
+    if s.isascii():
+        # ASCII matn NFKC dan o'zgarmaydi: lowercase + punctuation jadval orqali
+        s = s.lower().translate(_ASCII_PUNCT_TABLE)
+    else:
+        # Unicode normalize
+        s = unicodedata.normalize("NFKC", s)
+        # Lowercase
+        s = s.lower()
+        # Replace punctuation & symbols with space
+        s = _PUNCT_RE.sub(" ", s)
     # Collapse spaces
-    s = re.sub(r"\s+", " ", s).strip()
+    s = _WS_RE.sub(" ", s).strip()
 
     if unique_word_signature:
         # Signature by unique words (ignores order & duplicates)
@@ -44,13 +108,88 @@ def normalize_text(s: str, *, unique_word_signature: bool = False) -> str:
     return s
 
 
+def _token_hash64(token: str) -> int:
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(token.encode('utf-8'))
+    return int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), "big")
+
+
+def normalize_text_signature(clean_text: str) -> int:
+    """
+    So'z tartibiga bog'liq bo'lmagan 64-bitli imzo: noyob so'zlar hashlarining XOR i.
+    unique_word_signature rejimida text_hash shu qiymatdan olinadi (saralash va qayta yig'ishsiz).
+    """
+    return functools.reduce(operator.xor, map(_token_hash64, set(clean_text.split())), 0)
+
+
+def dump_json_bytes(data: Any) -> bytes:
+    """JSON ni UTF-8 baytlar sifatida yozish (orjson bo'lsa undan foydalaniladi)"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def dump_json_compact(data: Any) -> bytes:
+    """Ixcham (bo'shliqsiz, bitta qatorli) JSON baytlari"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+
+
+def json_size(data: Any) -> int:
+    """Ixcham (bo'shliqsiz) JSON ko'rinishining baytlardagi hajmi"""
+    return len(dump_json_compact(data))
+
+
+def load_json_bytes(raw: bytes) -> Any:
+    """UTF-8 baytlardan JSON o'qish"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode('utf-8'))
+
+
+def read_json_file(file_path: str) -> Tuple[Any, Optional[Exception]]:
+    """Bitta JSON faylni o'qish (ishchi oqim uchun): (tarkib, xatolik)"""
+    try:
+        with open(file_path, 'rb') as f:
+            return load_json_bytes(f.read()), None
+    except Exception as e:
+        return None, e
+
+
+@dataclass
+class FolderScan:
+    json_files: List[str] = field(default_factory=list)
+    audio_files: List[str] = field(default_factory=list)
+    folder_size: int = 0
+
+
+def scan_folder(folder_path: str) -> FolderScan:
+    """Papkani bitta os.scandir o'tishida JSON/audio fayllar va umumiy hajm bo'yicha sanash"""
+    scan = FolderScan()
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            ext = os.path.splitext(entry.name)[1].lower()
+            if ext == '.json':
+                scan.json_files.append(entry.name)
+            elif ext in AUDIO_EXT_SET:
+                scan.audio_files.append(entry.name)
+            if entry.is_file():
+                scan.folder_size += entry.stat().st_size
+    return scan
+
+
+def text_preview(text: str, limit: int) -> str:
+    """Matnni ``limit`` belgigacha qisqartirish (qisqartirilgan bo'lsa "..." qo'shiladi)"""
+    return text[:limit] + "..." if len(text) > limit else text
+
+
 def file_stem(name: str) -> str:
     return Path(name).stem
 
 
 def parse_created_at(s: str) -> Optional[str]:
     try:
-        from dateutil import parser as dtparser
         return dtparser.isoparse(s).isoformat()
     except Exception:
         return None
@@ -68,12 +207,88 @@ class SmartAudioDataManager:
         self.main_db_path = main_db_path
         self.similarity_threshold = similarity_threshold
         self.unique_word_signature = unique_word_signature
-        self.main_database = self.load_main_database()
+        self._journal = None
+        self.main_database = self._replay_journal(self.load_main_database())
+        self._rebuild_text_index()
+
+    def _rebuild_text_index(self):
+        """Tozalangan matnlar keshini (record_id bilan parallel ro'yxatlar) qayta qurish"""
+        self._record_ids = []
+        self._clean_texts = []
+        self._clean_by_id = {}
+        self._group_by_clean = {}
+        self._size_by_id = {}
+        self._token_index = {}
+        self._token_counts = []
+        for record_id, record in self.main_database["records"].items():
+            self._index_record(record_id, record)
+        if self.main_database["metadata"].get("hash_algo") != self._hash_algo:
+            self._rehash_records()
+
+    def _rehash_records(self):
+        """Eski algoritmdagi text_hash qiymatlarini joriy algoritm bilan qayta hisoblash"""
+        text_hashes = {}
+        for record_id, record in self.main_database["records"].items():
+            if not record.get("text"):
+                continue
+            text_hash = self._hash_clean_text(self._clean_by_id[record_id])
+            record["text_hash"] = text_hash
+            text_hashes.setdefault(text_hash, []).append(record_id)
+        self.main_database["text_hashes"] = text_hashes
+        self.main_database["metadata"]["hash_algo"] = self._hash_algo
+
+    @property
+    def _hash_algo(self) -> str:
+        """text_hash algoritmi nomi (so'z tartibisiz rejimda XOR imzo)"""
+        return f"{HASH_ALGO}-xor" if self.unique_word_signature else HASH_ALGO
+
+    def _index_record(self, record_id: str, record: Dict[str, Any]):
+        """Yangi recordni o'xshashlik qidiruvi keshiga va so'z indeksiga qo'shish"""
+        position = len(self._record_ids)
+        for key in _INTERNED_KEYS:
+            value = record.get(key)
+            if type(value) is str:
+                record[key] = sys.intern(value)
+        clean = self.clean_text(record.get("text", ""))
+        self._record_ids.append(record_id)
+        self._clean_texts.append(clean)
+        self._clean_by_id[record_id] = clean
+        if clean:
+            self._group_by_clean.setdefault(clean, []).append(record_id)
+        tokens = set(clean.split())
+        self._token_counts.append(len(tokens))
+        for token in tokens:
+            self._token_index.setdefault(token, set()).add(position)
+
+    def _candidate_positions(self, clean_text: str) -> List[int]:
+        """Kamida MIN_SHARED_TOKENS ta umumiy so'zga ega recordlar (qisqa nomzodlar uchun 1 ta)"""
+        tokens = set(clean_text.split())
+        if len(tokens) < SHORT_TEXT_TOKENS:
+            # Qisqa matnda umumiy so'z qolmasligi mumkin: barcha recordlar nomzod
+            # (RapidFuzz score_cutoff uzunligi mos kelmaganlarni tez tashlab yuboradi)
+            return list(range(len(self._record_ids)))
+
+        shared_counts = {}
+        for token in tokens:
+            for position in self._token_index.get(token, ()):
+                shared_counts[position] = shared_counts.get(position, 0) + 1
+
+        token_counts = self._token_counts
+        return sorted(position for position, count in shared_counts.items()
+                      if count >= MIN_SHARED_TOKENS or token_counts[position] < SHORT_TEXT_TOKENS)
 
     def clean_text(self, text: str) -> str:
         """Matnni taqqoslash uchun tozalash"""
         return normalize_text(text, unique_word_signature=self.unique_word_signature)
 
+    def record_size(self, record_id: str) -> int:
+        """Recordning JSON ko'rinishidagi hajmi (baytlarda; qo'shilganda hisoblanib keshlanadi)"""
+        size = self._size_by_id.get(record_id)
+        if size is None:
+            size = json_size(self.main_database["records"][record_id])
+            self._size_by_id[record_id] = size
+        return size
+
     def calculate_text_similarity(self, text1: str, text2: str) -> float:
         """Ikki matn orasidagi o'xshashlikni hisoblash"""
         clean_text1 = self.clean_text(text1)
@@ -82,53 +297,101 @@ class SmartAudioDataManager:
         if not clean_text1 or not clean_text2:
             return 0.0
 
+        if Indel is not None:
+            # fuzz.ratio bilan bir xil o'lchov (bit-parallel LCS), find_similar_records bilan mos
+            return Indel.normalized_similarity(clean_text1, clean_text2)
+
         similarity = SequenceMatcher(None, clean_text1, clean_text2).ratio()
         return similarity
 
     def create_text_hash(self, text: str) -> str:
         """Matn uchun hash yaratish"""
-        clean_text = self.clean_text(text)
+        return self._hash_clean_text(self.clean_text(text))
+
+    def _hash_clean_text(self, clean_text: str) -> str:
+        """Tozalangan matn uchun hash (kriptografik kuch shart emas, faqat kalit sifatida)"""
+        if self.unique_word_signature:
+            return f"{normalize_text_signature(clean_text):016x}"
+        if xxhash is not None:
+            return xxhash.xxh3_64_hexdigest(clean_text.encode('utf-8'))
         return hashlib.sha256(clean_text.encode('utf-8')).hexdigest()[:16]
 
+    def _similar_scores(self, clean_new: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Chegaradan o'tgan recordlarning pozitsiyalari (o'sish tartibida) va o'xshashlik qiymatlari"""
+        no_matches = (np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.float64))
+        if not clean_new:
+            return no_matches
+
+        # Faqat umumiy so'zlari bor recordlar taqqoslanadi
+        candidates = self._candidate_positions(clean_new)
+        if not candidates:
+            return no_matches
+        candidates = np.asarray(candidates, dtype=np.intp)
+
+        if process is not None:
+            # Butun taqqoslash RapidFuzz (C++) ichida bitta chaqiruvda bajariladi
+            cutoff = self.similarity_threshold * 100
+            scores = process.cdist([clean_new], [self._clean_texts[i] for i in candidates],
+                                   scorer=fuzz.ratio, score_cutoff=cutoff, dtype=np.float64)[0]
+            mask = scores >= cutoff
+            return candidates[mask], scores[mask] / 100
+
+        scores = np.array([SequenceMatcher(None, clean_new, self._clean_texts[i]).ratio() for i in candidates])
+        mask = scores >= self.similarity_threshold
+        return candidates[mask], scores[mask]
+
+    def _top_matches(self, positions: np.ndarray, scores: np.ndarray,
+                     limit: Optional[int] = None) -> List[Tuple[str, Dict, float]]:
+        """Eng o'xshash `limit` ta record (argpartition bilan O(N)); teng qiymatlarda oldingi record birinchi"""
+        selected = np.arange(len(scores))
+        if limit is not None and len(scores) > limit:
+            kth = np.partition(scores, len(scores) - limit)[len(scores) - limit]
+            above = np.flatnonzero(scores > kth)
+            ties = np.flatnonzero(scores == kth)[:limit - len(above)]
+            selected = np.concatenate([above, ties])
+        selected = selected[np.lexsort((positions[selected], -scores[selected]))]
+
+        records = self.main_database["records"]
+        return [(self._record_ids[positions[i]], records[self._record_ids[positions[i]]], float(scores[i]))
+                for i in selected]
+
     def find_similar_records(self, new_text: str) -> List[Tuple[str, Dict, float]]:
         """O'xshash matnlarni topish"""
-        similar_records = []
-
-        for record_id, record in self.main_database["records"].items():
-            existing_text = record.get("text", "")
-            similarity = self.calculate_text_similarity(new_text, existing_text)
-
-            if similarity >= self.similarity_threshold:
-                similar_records.append((record_id, record, similarity))
-
-        similar_records.sort(key=lambda x: x[2], reverse=True)
-        return similar_records
+        positions, scores = self._similar_scores(self.clean_text(new_text))
+        return self._top_matches(positions, scores)
 
     def load_main_database(self) -> Dict[str, Any]:
         """Ma'lumotlar bazasini yuklash"""
         if os.path.exists(self.main_db_path):
             try:
-                with open(self.main_db_path, 'r', encoding='utf-8') as file:
-                    data = json.load(file)
-                    if isinstance(data, list):
-                        new_format = {
-                            "metadata": {
-                                "total_records": len(data),
-                                "last_updated": datetime.now().isoformat(),
-                                "version": "3.0",
-                                "duplicate_policy": "smart_detection"
-                            },
-                            "records": {item.get("utt_id", f"record_{i}"): item
-                                        for i, item in enumerate(data)},
-                            "text_hashes": {},
-                            "settings": {
-                                "similarity_threshold": self.similarity_threshold,
-                                "unique_word_signature": self.unique_word_signature
-                            }
+                with open(self.main_db_path, 'rb') as file:
+                    data = load_json_bytes(file.read())
+                if isinstance(data, list):
+                    records = {item.get("utt_id", f"record_{i}"): item for i, item in enumerate(data)}
+                    text_hashes = {}
+                    for record_id, record in records.items():
+                        if record.get("text"):
+                            record["text_hash"] = self.create_text_hash(record["text"])
+                            text_hashes.setdefault(record["text_hash"], []).append(record_id)
+
+                    new_format = {
+                        "metadata": {
+                            "total_records": len(data),
+                            "last_updated": datetime.now().isoformat(),
+                            "version": "3.0",
+                            "duplicate_policy": "smart_detection",
+                            "hash_algo": self._hash_algo
+                        },
+                        "records": records,
+                        "text_hashes": text_hashes,
+                        "settings": {
+                            "similarity_threshold": self.similarity_threshold,
+                            "unique_word_signature": self.unique_word_signature
                         }
-                        self.save_main_database(new_format)
-                        return new_format
-                    return data
+                    }
+                    self.save_main_database(new_format)
+                    return new_format
+                return data
             except (json.JSONDecodeError, FileNotFoundError):
                 pass
 
@@ -137,7 +400,8 @@ class SmartAudioDataManager:
                 "total_records": 0,
                 "last_updated": datetime.now().isoformat(),
                 "version": "3.0",
-                "duplicate_policy": "smart_detection"
+                "duplicate_policy": "smart_detection",
+                "hash_algo": self._hash_algo
             },
             "records": {},
             "text_hashes": {},
@@ -152,8 +416,84 @@ class SmartAudioDataManager:
         if data is None:
             data = self.main_database
 
-        with open(self.main_db_path, 'w', encoding='utf-8') as file:
-            json.dump(data, file, ensure_ascii=False, indent=2)
+        # Avval vaqtinchalik faylga yoziladi, keyin atomar almashtiriladi
+        tmp_path = f"{self.main_db_path}.tmp"
+        with open(tmp_path, 'wb') as file:
+            file.write(dump_json_bytes(data))
+        os.replace(tmp_path, self.main_db_path)
+
+        if hasattr(self, "main_database") and data is self.main_database:
+            self._reset_journal()
+
+    @property
+    def _journal_path(self) -> str:
+        return f"{self.main_db_path}.jsonl"
+
+    def _replay_journal(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Oxirgi snapshotdan keyin jurnalga yozilgan recordlarni bazaga qo'llash"""
+        self._journal_entries = 0
+        try:
+            with open(self._journal_path, 'rb') as file:
+                raw = file.read()
+        except OSError:
+            return data
+
+        valid_end = 0
+        for line in raw.splitlines(keepends=True):
+            try:
+                entry = load_json_bytes(line)
+            except ValueError:
+                # Oxirgi qator to'liq yozilmay qolgan bo'lishi mumkin
+                break
+            valid_end += len(line)
+            record_id, record = entry["id"], entry["record"]
+            # Jurnalni boshqa algoritm (yoki boshqa ilova) yozgan bo'lsa, hash qayta hisoblanadi
+            if entry.get("hash_algo") != self._hash_algo and record.get("text"):
+                record["text_hash"] = self.create_text_hash(record["text"])
+            if record_id not in data["records"]:
+                data["metadata"]["total_records"] += 1
+                text_hash = record.get("text_hash")
+                if text_hash:
+                    data["text_hashes"].setdefault(text_hash, []).append(record_id)
+            data["records"][record_id] = record
+            data["metadata"]["last_updated"] = entry.get("at", data["metadata"].get("last_updated"))
+            self._journal_entries += 1
+
+        if valid_end < len(raw) or not raw.endswith(b"\n"):
+            # Uzilgan qatorni kesib tashlash: aks holda keyingi yozuv unga qo'shilib, o'qilmay qoladi
+            with open(self._journal_path, 'r+b') as file:
+                file.truncate(valid_end)
+                if valid_end and not raw[:valid_end].endswith(b"\n"):
+                    file.seek(valid_end)
+                    file.write(b"\n")
+
+        return data
+
+    def _journal_record(self, record_id: str):
+        """Qo'shilgan yoki yangilangan recordni jurnal oxiriga yozish (butun bazani qayta yozmasdan)"""
+        if self._journal is None:
+            self._journal = open(self._journal_path, 'ab', buffering=JOURNAL_BUFFER)
+        entry = {"id": record_id, "record": self.main_database["records"][record_id],
+                 "at": datetime.now().isoformat(), "hash_algo": self._hash_algo}
+        self._journal.write(dump_json_compact(entry) + b"\n")
+        self._journal_entries += 1
+
+        if self._journal_entries >= JOURNAL_SNAPSHOT_EVERY:
+            self.save_main_database()
+
+    def flush_journal(self):
+        """Jurnal buferini diskka yozish"""
+        if self._journal is not None:
+            self._journal.flush()
+
+    def _reset_journal(self):
+        """Snapshot saqlangandan keyin jurnalni tozalash"""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if os.path.exists(self._journal_path):
+            os.remove(self._journal_path)
+        self._journal_entries = 0
 
     def generate_unique_id(self, record: Dict[str, Any], filename: str) -> str:
         """ID yaratish"""
@@ -171,23 +511,28 @@ class SmartAudioDataManager:
         return base_id
 
     def add_record_streamlit(self, new_record: dict, filename: str,
-                             action_on_duplicate: str = "ask", folder_path: str = None) -> Dict[str, Any]:
-        """Streamlit uchun record qo'shish"""
+                             action_on_duplicate: str = "ask", folder_path: str = None,
+                             similar: Tuple[np.ndarray, np.ndarray] = None) -> Dict[str, Any]:
+        """Streamlit uchun record qo'shish (similar - oldindan hisoblangan (pozitsiyalar, o'xshashlik))"""
         try:
             new_text = new_record.get("text", "")
 
             if not new_text:
                 return {"status": "error", "message": "⚠️ Matn topilmadi", "filename": filename}
 
-            similar_records = self.find_similar_records(new_text)
+            if similar is None:
+                similar = self._similar_scores(self.clean_text(new_text))
+            positions, scores = similar
+            # Faqat eng o'xshash 3 tasi kerak: to'liq saralash o'rniga argpartition
+            similar_records = self._top_matches(positions, scores, limit=3)
 
             result = {
                 "status": "unknown",
                 "filename": filename,
                 "folder_path": folder_path,
                 "new_text": new_text,
-                "similar_count": len(similar_records),
-                "similar_records": similar_records[:3]
+                "similar_count": len(scores),
+                "similar_records": similar_records
             }
 
             if similar_records:
@@ -217,7 +562,10 @@ class SmartAudioDataManager:
                         existing_record["last_recorded_at"] = new_record["created_at"]
 
                     existing_record["updated_at"] = datetime.now().isoformat()
+                    self.main_database["metadata"]["last_updated"] = existing_record["updated_at"]
                     existing_record["source_files"] = existing_record.get("source_files", []) + [filename]
+                    self._size_by_id.pop(existing_id, None)
+                    self._journal_record(existing_id)
 
                     result["status"] = "updated"
                     result["message"] = f"🔄 Mavjud record yangilandi: {existing_id}"
@@ -233,7 +581,7 @@ class SmartAudioDataManager:
 
             if similar_records:
                 new_record["is_potential_duplicate"] = True
-                new_record["similar_to"] = [r[0] for r in similar_records[:3]]
+                new_record["similar_to"] = [r[0] for r in similar_records]
                 new_record["max_similarity"] = similar_records[0][2]
             else:
                 new_record["is_potential_duplicate"] = False
@@ -242,9 +590,10 @@ class SmartAudioDataManager:
             new_record["source_file"] = filename
             new_record["source_folder"] = folder_path
             new_record["added_at"] = datetime.now().isoformat()
-            new_record["text_hash"] = self.create_text_hash(new_text)
 
             self.main_database["records"][unique_id] = new_record
+            self._index_record(unique_id, new_record)
+            new_record["text_hash"] = self._hash_clean_text(self._clean_by_id[unique_id])
             self.main_database["metadata"]["total_records"] += 1
             self.main_database["metadata"]["last_updated"] = datetime.now().isoformat()
 
@@ -252,6 +601,8 @@ class SmartAudioDataManager:
             if text_hash not in self.main_database["text_hashes"]:
                 self.main_database["text_hashes"][text_hash] = []
             self.main_database["text_hashes"][text_hash].append(unique_id)
+            self._size_by_id[unique_id] = json_size(new_record)
+            self._journal_record(unique_id)
 
             result["status"] = "added"
             result["message"] = f"✅ Yangi record qo'shildi: {unique_id}"
@@ -267,30 +618,80 @@ class SmartAudioDataManager:
                 "folder_path": folder_path
             }
 
+    def add_records_batch(self, new_records: List[Any], filenames: List[str],
+                          action_on_duplicate: str = "ask", folder_path: str = None) -> List[Dict[str, Any]]:
+        """
+        Bir nechta recordni ketma-ket qo'shish. Mavjud bazaga nisbatan o'xshashlik
+        RapidFuzz cdist bilan bloklab (bitta native chaqiruvda) hisoblanadi,
+        partiya ichidagi oldingi recordlar bilan esa har bir record alohida taqqoslanadi.
+        """
+        if process is None:
+            return [self.add_record_streamlit(record, filename, action_on_duplicate, folder_path)
+                    for record, filename in zip(new_records, filenames)]
+
+        cutoff = self.similarity_threshold * 100
+        existing_count = len(self._clean_texts)
+        existing_texts = self._clean_texts[:existing_count]
+
+        # Matni bor recordlar uchun tozalangan matn; qolganlari add_record_streamlit xatosiga tushadi
+        clean_new = [self.clean_text(record.get("text", "")) if isinstance(record, dict) else ""
+                     for record in new_records]
+        scored = [i for i, clean in enumerate(clean_new) if clean]
+
+        existing_matches = {}
+        rows_per_block = max(1, BATCH_MATRIX_CELLS // max(1, existing_count))
+        for start in range(0, len(scored) if existing_count else 0, rows_per_block):
+            block = scored[start:start + rows_per_block]
+            scores = process.cdist([clean_new[i] for i in block], existing_texts,
+                                   scorer=fuzz.ratio, score_cutoff=cutoff,
+                                   dtype=np.float64, workers=-1)
+            for i, row in zip(block, scores):
+                positions = np.flatnonzero(row >= cutoff)
+                existing_matches[i] = (positions, row[positions] / 100)
+
+        results = []
+        batch_positions = []
+        for i, (new_record, filename) in enumerate(zip(new_records, filenames)):
+            similar = None
+            if clean_new[i]:
+                positions, scores = existing_matches.get(
+                    i, (np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.float64)))
+                if batch_positions:
+                    batch_scores = process.cdist([clean_new[i]], [self._clean_texts[pos] for pos in batch_positions],
+                                                 scorer=fuzz.ratio, score_cutoff=cutoff, dtype=np.float64)[0]
+                    mask = batch_scores >= cutoff
+                    positions = np.concatenate([positions, np.asarray(batch_positions, dtype=np.intp)[mask]])
+                    scores = np.concatenate([scores, batch_scores[mask] / 100])
+                similar = (positions, scores)
+
+            result = self.add_record_streamlit(new_record, filename, action_on_duplicate,
+                                               folder_path, similar=similar)
+            if result["status"] == "added":
+                batch_positions.append(len(self._record_ids) - 1)
+            results.append(result)
+
+        return results
+
     def get_available_source_folders(self) -> List[str]:
         """Loyihadagi mavjud papkalarni topish"""
         available_folders = []
         current_dir = os.getcwd()
 
         try:
-            for item in os.listdir(current_dir):
-                item_path = os.path.join(current_dir, item)
-                if os.path.isdir(item_path) and not item.startswith('.'):
-                    has_json = False
-                    has_audio = False
+            with os.scandir(current_dir) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.') or not entry.is_dir():
+                        continue
 
+                    # Bitta JSON yoki audio fayl topilishi yetarli
                     try:
-                        for file in os.listdir(item_path):
-                            if file.endswith('.json'):
-                                has_json = True
-                            if any(file.lower().endswith(ext) for ext in AUDIO_EXTS):
-                                has_audio = True
+                        with os.scandir(entry.path) as files:
+                            if any(f.name.endswith('.json') or os.path.splitext(f.name)[1].lower() in AUDIO_EXT_SET
+                                   for f in files):
+                                available_folders.append(entry.name)
                     except PermissionError:
                         continue
 
-                    if has_json or has_audio:
-                        available_folders.append(item)
-
         except Exception:
             pass
 
@@ -320,21 +721,27 @@ class SmartAudioDataManager:
             if not json_files:
                 return {"status": "warning", "message": f"📄 Papkada JSON fayllar topilmadi: {folder_path}"}
 
-            for json_file in json_files:
-                file_path = os.path.join(folder_path, json_file)
+            relative_folder = os.path.relpath(folder_path, os.getcwd())
+            file_paths = [os.path.join(folder_path, json_file) for json_file in json_files]
 
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        file_content = json.load(f)
+            # Fayllar oqimlarda o'qiladi, o'xshashlik esa butun partiya uchun bir martada hisoblanadi
+            with ThreadPoolExecutor(max_workers=min(32, os.cpu_count() or 1, len(file_paths))) as executor:
+                parsed_files = list(executor.map(read_json_file, file_paths))
 
-                    relative_folder = os.path.relpath(folder_path, os.getcwd())
+            readable = [i for i, (_, read_error) in enumerate(parsed_files) if read_error is None]
+            batch_results = dict(zip(readable, self.add_records_batch(
+                [parsed_files[i][0] for i in readable],
+                [json_files[i] for i in readable],
+                action_on_duplicate,
+                folder_path=relative_folder
+            )))
 
-                    result = self.add_record_streamlit(
-                        file_content,
-                        json_file,
-                        action_on_duplicate,
-                        folder_path=relative_folder
-                    )
+            for i, (json_file, (_, read_error)) in enumerate(zip(json_files, parsed_files)):
+                try:
+                    if read_error is not None:
+                        raise read_error
+
+                    result = batch_results[i]
 
                     results["details"].append(result)
                     results[result["status"]] += 1
@@ -344,7 +751,7 @@ class SmartAudioDataManager:
                     error_result = {
                         "status": "error",
                         "filename": json_file,
-                        "folder_path": os.path.relpath(folder_path, os.getcwd()),
+                        "folder_path": relative_folder,
                         "message": "❌ JSON format xatosi"
                     }
                     results["details"].append(error_result)
@@ -354,7 +761,7 @@ class SmartAudioDataManager:
                     error_result = {
                         "status": "error",
                         "filename": json_file,
-                        "folder_path": os.path.relpath(folder_path, os.getcwd()),
+                        "folder_path": relative_folder,
                         "message": f"❌ Xatolik: {str(e)}"
                     }
                     results["details"].append(error_result)
@@ -366,19 +773,8 @@ class SmartAudioDataManager:
             return {"status": "error", "message": f"❌ Papka qayta ishlashda xatolik: {str(e)}"}
 
     def find_unique_texts(self) -> Dict[str, List[str]]:
-        """Faqat noyob (takrorlanmaydigan) matnlarni topish"""
-        text_groups = {}
-
-        for record_id, record in self.main_database["records"].items():
-            text = record.get("text", "")
-            if text:
-                text_hash = self.create_text_hash(text)
-                if text_hash not in text_groups:
-                    text_groups[text_hash] = []
-                text_groups[text_hash].append(record_id)
-
-        unique_texts = {text_hash: ids for text_hash, ids in text_groups.items() if len(ids) == 1}
-        return unique_texts
+        """Faqat noyob (takrorlanmaydigan) matnlarni topish (text_hashes indeksidan, matnni qayta ishlamasdan)"""
+        return {text_hash: ids for text_hash, ids in self.main_database["text_hashes"].items() if len(ids) == 1}
 
     def get_unique_texts_info(self) -> Dict[str, Any]:
         """Noyob matnlar haqida statistik ma'lumot"""
@@ -398,8 +794,7 @@ class SmartAudioDataManager:
             record = self.main_database["records"].get(record_id)
 
             if record:
-                record_json = json.dumps(record, ensure_ascii=False)
-                record_size = len(record_json.encode('utf-8'))
+                record_size = self.record_size(record_id)
                 info["total_size_bytes"] += record_size
 
                 category = record.get("category", "unknown")
@@ -414,8 +809,7 @@ class SmartAudioDataManager:
 
                 info["unique_records"].append({
                     "record_id": record_id,
-                    "text_preview": record.get("text", "")[:100] + "..." if len(
-                        record.get("text", "")) > 100 else record.get("text", ""),
+                    "text_preview": text_preview(record.get("text", ""), 100),
                     "speaker_id": record.get("speaker_id"),
                     "category": record.get("category"),
                     "source_file": record.get("source_file"),
@@ -435,58 +829,33 @@ class SmartAudioDataManager:
             os.makedirs(destination_folder, exist_ok=True)
 
             unique_texts = self.find_unique_texts()
-            unique_records = []
-
-            # Noyob recordlarni tayyorlash
-            for text_hash, record_ids in unique_texts.items():
-                record_id = record_ids[0]
-                record = self.main_database["records"].get(record_id)
-
-                if record:
-                    unique_records.append({
-                        "utt_id": record.get("utt_id"),
-                        "text": record.get("text"),
-                        "duration_ms": record.get("duration_ms"),
-                        "speaker_id": record.get("speaker_id"),
-                        "created_at": record.get("created_at"),
-                        "sample_rate": record.get("sample_rate"),
-                        "bit_depth": record.get("bit_depth"),
-                        "lang": record.get("lang"),
-                        "gender": record.get("gender"),
-                        "device": record.get("device"),
-                        "region": record.get("region"),
-                        "sentiment": record.get("sentiment"),
-                        "annotation": record.get("annotation"),
-                        "category": record.get("category"),
-                        "source_file": record.get("source_file"),
-                        "source_folder": record.get("source_folder"),
-                        "_text_hash": text_hash
-                    })
+            records = self.main_database["records"]
 
-            # JSONL fayl yaratish
             jsonl_path = os.path.join(destination_folder, "unique_dataset.jsonl")
-            with open(jsonl_path, 'w', encoding='utf-8') as f:
-                for record in unique_records:
-                    clean_record = {k: v for k, v in record.items() if not k.startswith("_")}
-                    f.write(json.dumps(clean_record, ensure_ascii=False) + "\n")
-
-            # ZIP bundle yaratish
             zip_path = os.path.join(destination_folder, "unique_dataset_bundle.zip")
-            with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
-                # JSON fayllar
-                for record in unique_records:
-                    meta = {k: v for k, v in record.items() if not k.startswith("_")}
-                    zf.writestr(f"data/json/{record['utt_id']}.json",
-                                json.dumps(meta, ensure_ascii=False, indent=2))
-
-                # Manifest CSV
-                import csv
-                manifest = io.StringIO()
-                cw = csv.writer(manifest)
-                cw.writerow(["utt_id", "text_len", "source_folder", "source_file",
-                             "speaker_id", "category", "lang", "created_at"])
-
-                for record in unique_records:
+
+            manifest = io.StringIO()
+            cw = csv.writer(manifest)
+            cw.writerow(["utt_id", "text_len", "source_folder", "source_file",
+                         "speaker_id", "category", "lang", "created_at"])
+
+            # JSONL, ZIP ichidagi JSON fayllar va manifest bitta o'tishda yoziladi (oraliq ro'yxatsiz)
+            unique_count = 0
+            total_size = 0
+            with open(jsonl_path, 'w', encoding='utf-8') as f, \
+                    zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+                for record_ids in unique_texts.values():
+                    record = records.get(record_ids[0])
+                    if not record:
+                        continue
+
+                    meta = {key: record.get(key) for key in _BUNDLE_KEYS}
+                    f.write(json.dumps(meta, ensure_ascii=False) + "\n")
+
+                    meta_bytes = dump_json_bytes(meta)
+                    zf.writestr(f"data/json/{meta['utt_id']}.json", meta_bytes)
+                    total_size += len(meta_bytes)
+
                     cw.writerow([
                         record.get("utt_id", ""),
                         len(record.get("text", "")),
@@ -497,23 +866,23 @@ class SmartAudioDataManager:
                         record.get("lang", ""),
                         record.get("created_at", "")
                     ])
+                    unique_count += 1
 
                 zf.writestr("manifest.csv", manifest.getvalue())
 
                 # Summary JSON
                 summary = {
                     "created_at": datetime.now().isoformat(),
-                    "total_unique_records": len(unique_records),
+                    "total_unique_records": unique_count,
                     "similarity_threshold": self.similarity_threshold,
                     "unique_word_signature": self.unique_word_signature,
-                    "total_size_mb": round(sum(len(json.dumps(r, ensure_ascii=False).encode())
-                                               for r in unique_records) / (1024 * 1024), 2)
+                    "total_size_mb": round(total_size / (1024 * 1024), 2)
                 }
                 zf.writestr("dataset_summary.json", json.dumps(summary, ensure_ascii=False, indent=2))
 
             return {
                 "status": "success",
-                "unique_count": len(unique_records),
+                "unique_count": unique_count,
                 "jsonl_path": jsonl_path,
                 "zip_path": zip_path,
                 "destination_folder": destination_folder
@@ -523,20 +892,8 @@ class SmartAudioDataManager:
             return {"status": "error", "message": f"❌ Xatolik: {str(e)}"}
 
     def find_all_duplicates(self) -> Dict[str, List[str]]:
-        """Barcha takroriy matnlarni topish"""
-        text_groups = {}
-
-        for record_id, record in self.main_database["records"].items():
-            text = record.get("text", "")
-            clean_text = self.clean_text(text)
-
-            if clean_text:
-                if clean_text not in text_groups:
-                    text_groups[clean_text] = []
-                text_groups[clean_text].append(record_id)
-
-        duplicates = {text: ids for text, ids in text_groups.items() if len(ids) > 1}
-        return duplicates
+        """Barcha takroriy matnlarni topish (guruhlar record qo'shilganda yangilanadi)"""
+        return {text: ids for text, ids in self._group_by_clean.items() if len(ids) > 1}
 
     def get_duplicate_statistics(self) -> Dict[str, Any]:
         """Takroriy matnlar statistikasi"""
@@ -556,10 +913,7 @@ class SmartAudioDataManager:
 
             for record_id in ids:
                 record = self.main_database["records"][record_id]
-
-                record_json = json.dumps(record, ensure_ascii=False)
-                record_size = len(record_json.encode('utf-8'))
-                group_size += record_size
+                group_size += self.record_size(record_id)
 
                 duration = record.get("duration_ms", 0)
                 if duration:
@@ -597,10 +951,63 @@ class SmartAudioDataManager:
             "duplicate_size_bytes": total_duplicate_size,
             "duplicate_size_kb": round(total_duplicate_size / 1024, 2),
             "duplicate_size_mb": round(total_duplicate_size / (1024 * 1024), 2),
-            "duplicate_details": duplicate_details
+            "duplicate_details": duplicate_details,
+            # eng ko'p takrorlangan guruhlar (to'liq saralashsiz)
+            "top_duplicate_details": heapq.nlargest(
+                TOP_DUPLICATE_GROUPS, duplicate_details, key=operator.itemgetter("count"))
         }
 
 
+def stats_cache_key(manager: SmartAudioDataManager) -> Tuple:
+    """Statistika keshi kaliti: baza o'zgarganda (qo'shish/yangilash) yangilanadi"""
+    db = manager.main_database
+    return (manager.main_db_path, manager.unique_word_signature,
+            len(db["records"]), db["metadata"].get("last_updated"))
+
+
+@st.cache_data(max_entries=4)
+def cached_unique_texts_info(_manager: SmartAudioDataManager, cache_key: Tuple) -> Dict[str, Any]:
+    """get_unique_texts_info natijasini Streamlit qayta ishga tushishlari orasida saqlash"""
+    return _manager.get_unique_texts_info()
+
+
+@st.cache_data(max_entries=4)
+def cached_duplicate_statistics(_manager: SmartAudioDataManager, cache_key: Tuple) -> Dict[str, Any]:
+    """get_duplicate_statistics natijasini Streamlit qayta ishga tushishlari orasida saqlash"""
+    return _manager.get_duplicate_statistics()
+
+
+@st.cache_data(ttl=300, max_entries=4)
+def cached_file_bytes(path: str, mtime: float) -> bytes:
+    """Yuklab olish fayli tarkibi: (yo'l, mtime) bo'yicha keshlanadi, qayta ishga tushishlarda qayta o'qilmaydi"""
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+_STATUS_MAP = {
+    "added": "✅ Qo'shildi",
+    "updated": "🔄 Yangilandi",
+    "skipped": "⏭️ O'tkazildi",
+    "error": "❌ Xatolik"
+}
+
+
+def details_to_df(details: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Fayl tafsilotlari jadvali (ustunlar bo'yicha quriladi)"""
+    return pd.DataFrame({
+        "📄 Fayl": [d["filename"] for d in details],
+        "📊 Holat": [_STATUS_MAP.get(d["status"], "❓") for d in details],
+        "💬 Xabar": [d.get("message", "") for d in details]
+    })
+
+
+def distribution_to_df(counts: Dict[Any, int], label: str, total: int) -> pd.DataFrame:
+    """Qiymat bo'yicha taqsimot jadvali: foiz ustuni bitta vektor amal bilan hisoblanadi"""
+    df = pd.DataFrame({label: list(counts), "Soni": list(counts.values())})
+    df["Foiz"] = df["Soni"].mul(100.0 / total).round(1).astype(str) + "%"
+    return df.nlargest(TOP_DISTRIBUTION_ROWS, "Soni")
+
+
 def main():
     st.set_page_config(
         page_title="🧹 Audio+JSON Deduper",
@@ -752,19 +1159,29 @@ def main():
 
                         results = {"added": 0, "skipped": 0, "updated": 0, "errors": 0, "details": []}
 
-                        for i, file in enumerate(uploaded_files):
+                        # Avval barcha fayllar o'qiladi, keyin o'xshashlik bitta partiyada tekshiriladi
+                        parsed_files = []
+                        for file in uploaded_files:
                             try:
-                                file.seek(0)
-                                file_content = json.loads(file.read())
+                                parsed_files.append((load_json_bytes(file.getvalue()), None))
+                            except Exception as e:
+                                parsed_files.append((None, e))
 
-                                status_container.write(f"📝 Qayta ishlanmoqda: {file.name}")
+                        status_container.write(f"📝 {len(uploaded_files)} ta fayl qayta ishlanmoqda...")
+                        readable = [i for i, (_, read_error) in enumerate(parsed_files) if read_error is None]
+                        batch_results = dict(zip(readable, manager.add_records_batch(
+                            [parsed_files[i][0] for i in readable],
+                            [uploaded_files[i].name for i in readable],
+                            action_mode,
+                            folder_path="uploaded_files"
+                        )))
 
-                                result = manager.add_record_streamlit(
-                                    file_content,
-                                    file.name,
-                                    action_mode,
-                                    folder_path="uploaded_files"
-                                )
+                        for i, file in enumerate(uploaded_files):
+                            try:
+                                if parsed_files[i][1] is not None:
+                                    raise parsed_files[i][1]
+
+                                result = batch_results[i]
 
                                 results["details"].append(result)
                                 results[result["status"]] += 1
@@ -802,20 +1219,13 @@ def main():
                         with col4:
                             st.metric("❌ Xatolar", results["errors"])
 
-                        manager.save_main_database()
+                        # O'zgarishlar jurnalga yozilgan; to'liq snapshot "Saqlash" tugmasi bilan
+                        manager.flush_journal()
 
                         # Batafsil natijalar
                         if results["details"]:
                             with st.expander("📋 Batafsil natijalar"):
-                                for detail in results["details"]:
-                                    status_icon = {
-                                        "added": "✅",
-                                        "updated": "🔄",
-                                        "skipped": "⏭️",
-                                        "error": "❌"
-                                    }.get(detail["status"], "❓")
-
-                                    st.write(f"{status_icon} **{detail['filename']}**: {detail['message']}")
+                                st.dataframe(details_to_df(results["details"]), use_container_width=True)
 
         with subtab2:
             st.subheader("📂 Papka Bo'yicha Qayta Ishlash")
@@ -834,20 +1244,15 @@ def main():
                 if selected_folder:
                     # Papka statistikasi
                     folder_path = os.path.join(os.getcwd(), selected_folder)
-                    json_files = [f for f in os.listdir(folder_path) if f.lower().endswith('.json')]
-                    audio_files = [f for f in os.listdir(folder_path)
-                                   if any(f.lower().endswith(ext) for ext in AUDIO_EXTS)]
+                    folder_scan = scan_folder(folder_path)
 
                     col1, col2, col3 = st.columns(3)
                     with col1:
-                        st.metric("📄 JSON fayllar", len(json_files))
+                        st.metric("📄 JSON fayllar", len(folder_scan.json_files))
                     with col2:
-                        st.metric("🎵 Audio fayllar", len(audio_files))
+                        st.metric("🎵 Audio fayllar", len(folder_scan.audio_files))
                     with col3:
-                        folder_size = sum(os.path.getsize(os.path.join(folder_path, f))
-                                          for f in os.listdir(folder_path)
-                                          if os.path.isfile(os.path.join(folder_path, f)))
-                        st.metric("📊 Papka hajmi (MB)", f"{folder_size / (1024 * 1024):.1f}")
+                        st.metric("📊 Papka hajmi (MB)", f"{folder_scan.folder_size / (1024 * 1024):.1f}")
 
                     folder_action = st.selectbox(
                         "🎮 Papka uchun harakat:",
@@ -877,20 +1282,11 @@ def main():
                             with col5:
                                 st.metric("❌ Xatolar", results["errors"])
 
-                            manager.save_main_database()
+                            manager.flush_journal()
 
                             if results["details"]:
                                 with st.expander(f"📋 {len(results['details'])} ta fayl tafsiloti"):
-                                    details_df = pd.DataFrame([{
-                                        "📄 Fayl": d["filename"],
-                                        "📊 Holat": {
-                                            "added": "✅ Qo'shildi",
-                                            "updated": "🔄 Yangilandi",
-                                            "skipped": "⏭️ O'tkazildi",
-                                            "error": "❌ Xatolik"
-                                        }.get(d["status"], "❓"),
-                                        "💬 Xabar": d.get("message", "")
-                                    } for d in results["details"]])
+                                    details_df = details_to_df(results["details"])
                                     st.dataframe(details_df, use_container_width=True)
                         else:
                             st.error(results["message"])
@@ -902,8 +1298,10 @@ def main():
 
         # Umumiy statistika
         total_records = len(manager.main_database["records"])
-        unique_info = manager.get_unique_texts_info()
-        duplicate_stats = manager.get_duplicate_statistics()
+        # tab1 dagi o'zgarishlardan keyin bir marta hisoblanadi va tab3/tab4 da qayta ishlatiladi
+        stats_key = stats_cache_key(manager)
+        unique_info = cached_unique_texts_info(manager, stats_key)
+        duplicate_stats = cached_duplicate_statistics(manager, stats_key)
 
         st.subheader("📈 Umumiy Ko'rsatkichlar")
         col1, col2, col3, col4 = st.columns(4)
@@ -922,25 +1320,19 @@ def main():
         # Kategoriya va speaker statistikasi
         if unique_info["categories"]:
             st.subheader("📋 Kategoriya Bo'yicha Taqsimot")
-            category_df = pd.DataFrame([
-                {"Kategoriya": k, "Soni": v, "Foiz": f"{(v / unique_info['total_unique_texts'] * 100):.1f}%"}
-                for k, v in unique_info["categories"].items()
-            ]).sort_values("Soni", ascending=False)
+            category_df = distribution_to_df(
+                unique_info["categories"], "Kategoriya", unique_info["total_unique_texts"])
             st.dataframe(category_df, use_container_width=True)
 
         if unique_info["speakers"]:
             st.subheader("👥 Speaker Bo'yicha Taqsimot")
-            speaker_df = pd.DataFrame([
-                {"Speaker ID": k, "Soni": v, "Foiz": f"{(v / unique_info['total_unique_texts'] * 100):.1f}%"}
-                for k, v in unique_info["speakers"].items()
-            ]).sort_values("Soni", ascending=False)
+            speaker_df = distribution_to_df(
+                unique_info["speakers"], "Speaker ID", unique_info["total_unique_texts"])
             st.dataframe(speaker_df, use_container_width=True)
 
     with tab3:
         st.header("🔍 Takroriy Matnlar Tahlili")
 
-        duplicate_stats = manager.get_duplicate_statistics()
-
         if duplicate_stats["duplicate_groups"] > 0:
             col1, col2, col3, col4 = st.columns(4)
 
@@ -963,22 +1355,17 @@ def main():
             if duplicate_stats["duplicate_details"]:
                 st.subheader("📋 Takroriy Guruhlar")
 
-                dup_table_data = []
-                for i, detail in enumerate(duplicate_stats["duplicate_details"][:20], 1):
-                    size_str = f"{detail['size_mb']:.2f} MB" if detail[
-                                                                    'size_mb'] >= 1 else f"{detail['size_kb']:.2f} KB"
-                    text_preview = detail["text"][:80] + "..." if len(detail["text"]) > 80 else detail["text"]
-
-                    dup_table_data.append({
-                        "№": i,
-                        "🔄 Takrorlar": detail["count"],
-                        "📝 Matn": text_preview,
-                        "💾 Hajm": size_str,
-                        "👥 Speakerlar": detail["speaker_count"],
-                        "🏷️ Kategoriyalar": ", ".join(detail["categories"][:2])
-                    })
-
-                dup_df = pd.DataFrame(dup_table_data)
+                top_details = duplicate_stats["top_duplicate_details"]
+                previews = [text_preview(d["text"], 80) for d in top_details]
+                dup_df = pd.DataFrame({
+                    "№": range(1, len(top_details) + 1),
+                    "🔄 Takrorlar": [d["count"] for d in top_details],
+                    "📝 Matn": previews,
+                    "💾 Hajm": [f"{d['size_mb']:.2f} MB" if d["size_mb"] >= 1 else f"{d['size_kb']:.2f} KB"
+                               for d in top_details],
+                    "👥 Speakerlar": [d["speaker_count"] for d in top_details],
+                    "🏷️ Kategoriyalar": [", ".join(d["categories"][:2]) for d in top_details]
+                })
                 st.dataframe(dup_df, use_container_width=True)
         else:
             st.success("🎉 Takroriy matnlar topilmadi! Barcha ma'lumotlar noyob.")
@@ -986,8 +1373,6 @@ def main():
     with tab4:
         st.header("✨ Noyob Ma'lumotlar To'plami")
 
-        unique_info = manager.get_unique_texts_info()
-
         if unique_info["total_unique_texts"] > 0:
             # Statistika
             col1, col2, col3, col4 = st.columns(4)
@@ -1035,25 +1420,25 @@ def main():
 
                     with col1:
                         try:
-                            with open(result['jsonl_path'], 'rb') as f:
-                                st.download_button(
-                                    "⬇️ JSONL Yuklab Olish",
-                                    data=f.read(),
-                                    file_name="unique_dataset.jsonl",
-                                    mime="application/jsonl"
-                                )
+                            jsonl_path = result['jsonl_path']
+                            st.download_button(
+                                "⬇️ JSONL Yuklab Olish",
+                                data=cached_file_bytes(jsonl_path, os.path.getmtime(jsonl_path)),
+                                file_name="unique_dataset.jsonl",
+                                mime="application/jsonl"
+                            )
                         except Exception as e:
                             st.error(f"JSONL yuklab olishda xatolik: {e}")
 
                     with col2:
                         try:
-                            with open(result['zip_path'], 'rb') as f:
-                                st.download_button(
-                                    "⬇️ ZIP Bundle Yuklab Olish",
-                                    data=f.read(),
-                                    file_name="unique_dataset_bundle.zip",
-                                    mime="application/zip"
-                                )
+                            zip_path = result['zip_path']
+                            st.download_button(
+                                "⬇️ ZIP Bundle Yuklab Olish",
+                                data=cached_file_bytes(zip_path, os.path.getmtime(zip_path)),
+                                file_name="unique_dataset_bundle.zip",
+                                mime="application/zip"
+                            )
                         except Exception as e:
                             st.error(f"ZIP yuklab olishda xatolik: {e}")
 
@@ -1063,18 +1448,15 @@ def main():
             # Noyob yozuvlarni preview
             with st.expander("👁️ Noyob yozuvlar preview (dastlabki 20 ta)"):
                 if unique_info["unique_records"]:
-                    preview_data = []
-                    for record in unique_info["unique_records"][:20]:
-                        preview_data.append({
-                            "🆔 ID": record["record_id"],
-                            "📝 Matn": record["text_preview"],
-                            "👤 Speaker": record["speaker_id"] or "N/A",
-                            "🏷️ Kategoriya": record["category"] or "N/A",
-                            "📁 Papka": record["source_folder"] or "N/A",
-                            "💾 Hajm": f"{record['size_bytes'] / 1024:.1f} KB"
-                        })
-
-                    preview_df = pd.DataFrame(preview_data)
+                    preview_records = unique_info["unique_records"][:20]
+                    preview_df = pd.DataFrame({
+                        "🆔 ID": [r["record_id"] for r in preview_records],
+                        "📝 Matn": [r["text_preview"] for r in preview_records],
+                        "👤 Speaker": [r["speaker_id"] or "N/A" for r in preview_records],
+                        "🏷️ Kategoriya": [r["category"] or "N/A" for r in preview_records],
+                        "📁 Papka": [r["source_folder"] or "N/A" for r in preview_records],
+                        "💾 Hajm": [f"{r['size_bytes'] / 1024:.1f} KB" for r in preview_records]
+                    })
                     st.dataframe(preview_df, use_container_width=True)
 
         else:
@@ -1097,6 +1479,8 @@ def main():
 
             if st.button("⬇️ Bazani Yuklab Olish"):
                 try:
+                    # Jurnaldagi o'zgarishlar ham faylga tushishi uchun avval snapshot
+                    manager.save_main_database()
                     with open(manager.main_db_path, 'r', encoding='utf-8') as f:
                         file_content = f.read()
                         st.download_button(
@@ -1111,9 +1495,14 @@ def main():
         with col2:
             st.subheader("🔧 Tizim Ma'lumotlari")
 
+            # exists + getsize o'rniga bitta stat chaqiruvi
+            try:
+                db_size = f"{os.stat(manager.main_db_path).st_size / 1024:.2f} KB"
+            except OSError:
+                db_size = "Mavjud emas"
+
             db_stats = {
-                "📊 Ma'lumotlar bazasi hajmi": f"{os.path.getsize(manager.main_db_path) / 1024:.2f} KB" if os.path.exists(
-                    manager.main_db_path) else "Mavjud emas",
+                "📊 Ma'lumotlar bazasi hajmi": db_size,
                 "🆔 Ma'lumotlar bazasi versiyasi": manager.main_database.get("metadata", {}).get("version", "N/A"),
                 "📅 So'nggi yangilanish": manager.main_database.get("metadata", {}).get("last_updated", "N/A")[:19],
                 "🎯 O'xshashlik chegarasi": f"{similarity_threshold:.2f}",
@@ -1,12 +1,25 @@
 import streamlit as st
+import io
 import json
 import os
+import sys
 import shutil
 import pandas as pd
-from pathlib import Path
 import zipfile
 import tempfile
-from collections import defaultdict, Counter
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+AUDIO_EXTS = {'.wav', '.mp3', '.ogg', '.flac', '.m4a'}
+PRECOMPRESSED_EXTS = {'.mp3', '.ogg', '.flac', '.m4a'}
+MATCH_KEYS = ('utt_id', 'id', 'file_id', 'filename')
+DUPLICATE_PREVIEW_LIMIT = 500
+ZIP_WRITE_BUFFER = 1 << 20
 
 
 def scan_folder_for_files(folder_path):
@@ -17,110 +30,159 @@ def scan_folder_for_files(folder_path):
     if not folder_path or not os.path.exists(folder_path):
         return json_files, audio_files
 
-    folder = Path(folder_path)
+    # Papkani bir marta o'qib, fayllarni kengaytmasi bo'yicha ajratish
+    with os.scandir(folder_path) as it:
+        for entry in it:
+            if not entry.is_file():
+                continue
 
-    # JSON fayllarni qidirish
-    for json_file in folder.glob("*.json"):
-        json_files.append(str(json_file))
+            name = entry.name
+            dot = name.rfind('.')
+            if dot <= 0:
+                continue
+            ext = name[dot:].lower()
 
-    # Audio fayllarni qidirish va indekslash
-    audio_extensions = ['.wav', '.mp3', '.ogg', '.flac', '.m4a']
-    for ext in audio_extensions:
-        for audio_file in folder.glob(f"*{ext}"):
-            # Fayl nomini (kengaytmasiz) kalit sifatida ishlatish
-            file_stem = audio_file.stem
-            audio_files[file_stem] = str(audio_file)
+            if ext == '.json':
+                json_files.append(entry.path)
+            elif ext in AUDIO_EXTS:
+                # Fayl nomini (kengaytmasiz, katta-kichik harfsiz) kalit sifatida ishlatish
+                audio_files[name[:dot].casefold()] = entry.path
 
     return json_files, audio_files
 
 
-def load_all_json_files(json_file_paths):
-    """Barcha JSON fayllarni yuklash"""
-    all_data = []
-    failed_files = []
+def _load_one(file_path):
+    """Bitta JSON faylni o'qish (ishchi oqim uchun)"""
+    try:
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+        if orjson is not None:
+            return file_path, orjson.loads(raw), None
+        return file_path, json.loads(raw.decode('utf-8')), None
+    except Exception as e:
+        return file_path, None, str(e)
 
-    for file_path in json_file_paths:
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if isinstance(data, list):
-                    all_data.extend(data)
-                else:
-                    all_data.append(data)
-        except Exception as e:
-            failed_files.append((file_path, str(e)))
-            st.warning(f"Fayl o'qilmadi: {os.path.basename(file_path)} - {str(e)}")
 
-    return all_data, failed_files
+def _map_batched(func, json_file_paths):
+    """Fayllarni oqimlarda qayta ishlash; bir vaqtda faqat `workers` ta natija xotirada turadi"""
+    if not json_file_paths:
+        return
 
+    workers = min(32, len(json_file_paths))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for start in range(0, len(json_file_paths), workers):
+            yield from executor.map(func, json_file_paths[start:start + workers])
 
-def find_unique_texts_detailed(json_data):
-    """Noyob matnlarni topish va batafsil tahlil"""
-    text_counts = Counter()
-    text_to_items = defaultdict(list)
 
-    # Matnlarni sanash va guruhlash
-    for item in json_data:
-        text = item.get('text', '').strip()
-        if text:
-            text_counts[text] += 1
-            text_to_items[text].append(item)
+def iter_records(json_file_paths, failed_files=None):
+    """JSON yozuvlarini fayl-fayl bo'yicha oqim sifatida berish (hammasi xotirada saqlanmaydi)"""
+    for file_path, data, error in _map_batched(_load_one, json_file_paths):
+        if error is not None:
+            if failed_files is not None:
+                failed_files.append((file_path, error))
+        elif isinstance(data, list):
+            yield from data
+        else:
+            yield data
 
-    # Faqat bir marta uchraydigan matnlarni olish
-    unique_items = []
-    for text, count in text_counts.items():
+
+def find_unique_texts_streaming(json_file_paths):
+    """Noyob matnlarni bitta o'tishda topish: har bir matn uchun faqat birinchi yozuv saqlanadi"""
+    failed_files = []
+    text_counts = {}
+    first_seen = {}
+    total_records = 0
+
+    # Tsikl ichida global/atribut qidiruvlarini kamaytirish uchun lokal nomlar
+    intern_text = _intern_text
+    counts_get = text_counts.get
+
+    # Takrorlangan matnning yozuvi None bilan belgilanadi, shuning uchun xotirada
+    # har bir turli matn uchun ko'pi bilan bitta yozuv qoladi
+    for item in iter_records(json_file_paths, failed_files):
+        total_records += 1
+        text = intern_text(item.get('text'))
+        if not text:
+            continue
+        count = counts_get(text, 0) + 1
+        text_counts[text] = count
         if count == 1:
-            unique_items.extend(text_to_items[text])
+            first_seen[text] = item
+        elif count == 2:
+            first_seen[text] = None
 
+    unique_items = [item for item in first_seen.values() if item is not None]
     duplicate_texts = {text: count for text, count in text_counts.items() if count > 1}
 
-    return unique_items, duplicate_texts, text_counts
+    return total_records, failed_files, unique_items, duplicate_texts
+
+
+def _intern_text(text):
+    """Matnni tozalab, intern qilingan satrni qaytarish"""
+    if not isinstance(text, str):
+        return ''
+    return sys.intern(text.strip())
 
 
 def match_audio_files(unique_items, audio_files_dict):
     """Audio fayllarni JSON bilan moslashtirish"""
     matched_files = []
     unmatched_files = []
+    audio_get = audio_files_dict.get
+    matched_append = matched_files.append
+    unmatched_append = unmatched_files.append
+    match_keys = MATCH_KEYS
 
     for item in unique_items:
-        # Turli usullar bilan audio faylni qidirish
-        audio_found = False
-
-        # 1. utt_id bo'yicha qidirish
-        if 'utt_id' in item and item['utt_id'] in audio_files_dict:
-            matched_files.append({
-                'json_item': item,
-                'audio_path': audio_files_dict[item['utt_id']],
-                'match_method': 'utt_id'
-            })
-            audio_found = True
-
-        # 2. Agar utt_id bo'yicha topilmasa, boshqa maydonlar bo'yicha qidirish
-        if not audio_found:
-            for key in ['id', 'file_id', 'filename']:
-                if key in item and item[key] in audio_files_dict:
-                    matched_files.append({
-                        'json_item': item,
-                        'audio_path': audio_files_dict[item[key]],
-                        'match_method': key
-                    })
-                    audio_found = True
-                    break
-
-        if not audio_found:
-            unmatched_files.append(item)
+        item_get = item.get
+        # Avval utt_id, keyin boshqa maydonlar bo'yicha qidirish
+        for key in match_keys:
+            value = item_get(key)
+            if not value:
+                continue
+            audio_path = audio_get(value.casefold() if isinstance(value, str) else value)
+            if audio_path:
+                matched_append({
+                    'json_item': item,
+                    'audio_path': audio_path,
+                    'match_method': key
+                })
+                break
+        else:
+            unmatched_append(item)
 
     return matched_files, unmatched_files
 
 
-def create_output_package(unique_items, matched_files, output_folder):
+def dump_json_bytes(data):
+    """JSON ni UTF-8 baytlar sifatida yozish (orjson bo'lsa undan foydalaniladi)"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def _copy_audio_file(src_path, dst_path, use_hardlinks=True):
+    """Faylni nusxalash: imkon bo'lsa hardlink, aks holda copyfile (sendfile) + copystat"""
+    if use_hardlinks:
+        try:
+            # Bir xil fayl tizimida ma'lumot nusxalanmaydi
+            os.link(src_path, dst_path)
+            return
+        except OSError:
+            pass
+
+    shutil.copyfile(src_path, dst_path)
+    shutil.copystat(src_path, dst_path)
+
+
+def create_output_package(unique_items, matched_files, output_folder, use_hardlinks=True):
     """Chiqish paketini yaratish"""
     os.makedirs(output_folder, exist_ok=True)
 
     # JSON faylni saqlash
     json_output_path = os.path.join(output_folder, "noyob_matnlar.json")
-    with open(json_output_path, 'w', encoding='utf-8') as f:
-        json.dump(unique_items, f, ensure_ascii=False, indent=2)
+    with open(json_output_path, 'wb') as f:
+        f.write(dump_json_bytes(unique_items))
 
     # Audio fayllar papkasi
     audio_output_folder = os.path.join(output_folder, "audio_fayllar")
@@ -129,18 +191,23 @@ def create_output_package(unique_items, matched_files, output_folder):
     copied_count = 0
     copy_errors = []
 
-    # Audio fayllarni nusxalash
-    for match in matched_files:
+    def copy_one(match):
+        src_path = match['audio_path']
+        filename = os.path.basename(src_path)
         try:
-            src_path = match['audio_path']
-            filename = os.path.basename(src_path)
-            dst_path = os.path.join(audio_output_folder, filename)
-
-            shutil.copy2(src_path, dst_path)
-            copied_count += 1
-
+            _copy_audio_file(src_path, os.path.join(audio_output_folder, filename), use_hardlinks)
+            return None
         except Exception as e:
-            copy_errors.append(f"{filename}: {str(e)}")
+            return f"{filename}: {str(e)}"
+
+    # Audio fayllarni parallel nusxalash (I/O oqimlarda kutiladi)
+    if matched_files:
+        with ThreadPoolExecutor(max_workers=min(32, len(matched_files))) as executor:
+            for error in executor.map(copy_one, matched_files):
+                if error is None:
+                    copied_count += 1
+                else:
+                    copy_errors.append(error)
 
     # Hisobot yaratish
     report = {
@@ -155,27 +222,111 @@ def create_output_package(unique_items, matched_files, output_folder):
     return report
 
 
+def create_zip_package(unique_items, matched_files, zip_path):
+    """ZIP paketni oraliq papkasiz yaratish: audio fayllar manbadan to'g'ridan-to'g'ri yoziladi"""
+    added_count = 0
+    copy_errors = []
+
+    # Siqilgan audio (mp3/ogg/flac/m4a) siqilmasdan saqlanadi, qolganlari past darajada siqiladi.
+    # 1 MB bufer kichik write() tizim chaqiruvlari sonini kamaytiradi
+    with open(zip_path, 'wb', buffering=ZIP_WRITE_BUFFER) as raw, \
+            zipfile.ZipFile(raw, 'w', zipfile.ZIP_DEFLATED, compresslevel=1,
+                            allowZip64=True, strict_timestamps=False) as zipf:
+        zipf.writestr("noyob_matnlar.json", dump_json_bytes(unique_items))
+
+        for match in matched_files:
+            src_path = match['audio_path']
+            filename = os.path.basename(src_path)
+            ext = os.path.splitext(filename)[1].lower()
+            compress_type = zipfile.ZIP_STORED if ext in PRECOMPRESSED_EXTS else zipfile.ZIP_DEFLATED
+            try:
+                zipf.write(src_path, arcname=f"audio_fayllar/{filename}", compress_type=compress_type)
+                added_count += 1
+            except Exception as e:
+                copy_errors.append(f"{filename}: {str(e)}")
+
+    report = {
+        'umumiy_json': len(unique_items),
+        'moslashgan_audio': len(matched_files),
+        'nusxalangan_audio': added_count,
+        'nusxalash_xatolari': copy_errors,
+        'zip_fayl': zip_path
+    }
+
+    return report
+
+
 def create_statistics_dataframe(unique_items):
     """Statistika uchun DataFrame yaratish"""
     if not unique_items:
         return pd.DataFrame()
 
-    stats_data = []
-    for item in unique_items:
-        stats_data.append({
-            'ID': item.get('utt_id', 'N/A'),
-            'Matn (qisqa)': item.get('text', '')[:50] + '...' if len(item.get('text', '')) > 50 else item.get('text',
-                                                                                                              ''),
-            'Davomiyligi (ms)': item.get('duration_ms', 'N/A'),
-            'So\'zlovchi ID': item.get('speaker_id', 'N/A'),
-            'Jins': item.get('gender', 'N/A'),
-            'Hudud': item.get('region', 'N/A'),
-            'Kategoriya': item.get('category', 'N/A'),
-            'Kayfiyat': item.get('sentiment', 'N/A'),
-            'Yaratilgan': item.get('created_at', 'N/A')[:10] if item.get('created_at') else 'N/A'
-        })
-
-    return pd.DataFrame(stats_data)
+    # Ustunlar bo'yicha (SoA) to'plash - har bir qator uchun lug'at yaratilmaydi
+    n = len(unique_items)
+    ids = [None] * n
+    texts = [None] * n
+    durations = [None] * n
+    speakers = [None] * n
+    genders = [None] * n
+    regions = [None] * n
+    categories = [None] * n
+    sentiments = [None] * n
+    created = [None] * n
+
+    for i, item in enumerate(unique_items):
+        get = item.get
+        text = get('text', '')
+        created_at = get('created_at')
+
+        ids[i] = get('utt_id', 'N/A')
+        texts[i] = text[:50] + '...' if len(text) > 50 else text
+        durations[i] = get('duration_ms', 'N/A')
+        speakers[i] = get('speaker_id', 'N/A')
+        genders[i] = get('gender', 'N/A')
+        regions[i] = get('region', 'N/A')
+        categories[i] = get('category', 'N/A')
+        sentiments[i] = get('sentiment', 'N/A')
+        created[i] = created_at[:10] if created_at else 'N/A'
+
+    return pd.DataFrame({
+        'ID': ids,
+        'Matn (qisqa)': texts,
+        'Davomiyligi (ms)': durations,
+        'So\'zlovchi ID': speakers,
+        'Jins': genders,
+        'Hudud': regions,
+        'Kategoriya': categories,
+        'Kayfiyat': sentiments,
+        'Yaratilgan': created
+    }, copy=False)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def scan_folder_cached(folder_path, mtime_ns):
+    """Papka skanerlash natijasini keshlash; kalit - papka yo'li va uning o'zgartirilgan vaqti"""
+    return scan_folder_for_files(folder_path)
+
+
+def file_stamps(json_file_paths):
+    """Kesh kaliti uchun (yo'l, o'zgartirilgan vaqt) juftliklari"""
+    stamps = []
+    for file_path in json_file_paths:
+        try:
+            stamps.append((file_path, os.stat(file_path).st_mtime_ns))
+        except OSError:
+            stamps.append((file_path, None))
+    return tuple(stamps)
+
+
+@st.cache_data(show_spinner=False)
+def analyze_dataset(json_file_stamps, audio_files_dict):
+    """Yuklash, noyob matnlar va audio moslashtirish; fayllar o'zgarmasa qayta hisoblanmaydi"""
+    json_file_paths = [file_path for file_path, _ in json_file_stamps]
+
+    total_records, failed_files, unique_items, duplicate_texts = find_unique_texts_streaming(json_file_paths)
+    matched_files, unmatched_files = match_audio_files(unique_items, audio_files_dict)
+
+    return total_records, failed_files, unique_items, duplicate_texts, matched_files, unmatched_files
 
 
 def main():
@@ -205,8 +356,8 @@ def main():
             if os.path.exists(folder_path):
                 st.success("✅ Papka topildi")
 
-                # Fayllarni skanerlash
-                json_files, audio_files = scan_folder_for_files(folder_path)
+                # Fayllarni skanerlash (papka o'zgarmagan bo'lsa keshdan olinadi)
+                json_files, audio_files = scan_folder_cached(folder_path, os.stat(folder_path).st_mtime_ns)
 
                 st.info(f"📄 JSON fayllar: {len(json_files)}")
                 st.info(f"🎵 Audio fayllar: {len(audio_files)}")
@@ -228,20 +379,18 @@ def main():
     if hasattr(st.session_state, 'start_processing') and st.session_state.start_processing:
 
         with st.spinner("Ma'lumotlar tahlil qilinmoqda..."):
-            # JSON fayllarni yuklash
-            all_json_data, failed_files = load_all_json_files(st.session_state.json_files)
-
-            # Noyob matnlarni topish
-            unique_items, duplicate_texts, text_counts = find_unique_texts_detailed(all_json_data)
+            # Yuklash, noyob matnlarni topish va audio moslashtirish (natija keshlanadi)
+            total_records, failed_files, unique_items, duplicate_texts, matched_files, unmatched_files = \
+                analyze_dataset(file_stamps(st.session_state.json_files), st.session_state.audio_files)
 
-            # Audio fayllar bilan moslashtirish
-            matched_files, unmatched_files = match_audio_files(unique_items, st.session_state.audio_files)
+        for file_path, error in failed_files:
+            st.warning(f"Fayl o'qilmadi: {os.path.basename(file_path)} - {error}")
 
         # Statistikalar
         col1, col2, col3, col4 = st.columns(4)
 
         with col1:
-            st.metric("📊 Umumiy JSON yozuvlar", len(all_json_data))
+            st.metric("📊 Umumiy JSON yozuvlar", total_records)
 
         with col2:
             st.metric("🎯 Noyob matnlar", len(unique_items))
@@ -263,11 +412,12 @@ def main():
                 df = create_statistics_dataframe(unique_items)
                 st.dataframe(df, use_container_width=True, height=400)
 
-                # CSV yuklab olish
-                csv = df.to_csv(index=False, encoding='utf-8')
+                # CSV yuklab olish (to'g'ridan-to'g'ri UTF-8 baytlarga yoziladi)
+                csv_buffer = io.BytesIO()
+                df.to_csv(csv_buffer, index=False, encoding='utf-8')
                 st.download_button(
                     label="📁 CSV formatda yuklab olish",
-                    data=csv.encode('utf-8'),
+                    data=csv_buffer.getvalue(),
                     file_name="noyob_matnlar.csv",
                     mime="text/csv"
                 )
@@ -295,11 +445,20 @@ def main():
             if duplicate_texts:
                 st.subheader(f"🔄 Takroriy matnlar ({len(duplicate_texts)} ta)")
 
-                duplicate_df = pd.DataFrame([
-                    {'Matn': text[:100] + '...' if len(text) > 100 else text,
-                     'Takrorlanish soni': count}
-                    for text, count in duplicate_texts.items()
-                ])
+                show_all = len(duplicate_texts) <= DUPLICATE_PREVIEW_LIMIT or st.checkbox(
+                    f"Hammasini ko'rsatish (standart: eng ko'p takrorlangan {DUPLICATE_PREVIEW_LIMIT} ta)"
+                )
+
+                # Eng ko'p takrorlanganlar birinchi; jadval ustunlar bo'yicha quriladi
+                items = sorted(duplicate_texts.items(), key=lambda kv: -kv[1])
+                if not show_all:
+                    items = items[:DUPLICATE_PREVIEW_LIMIT]
+                texts, counts = zip(*items)
+
+                duplicate_df = pd.DataFrame({
+                    'Matn': [text[:100] + '...' if len(text) > 100 else text for text in texts],
+                    'Takrorlanish soni': counts
+                })
 
                 st.dataframe(duplicate_df, use_container_width=True)
             else:
@@ -315,13 +474,19 @@ def main():
                 help="Noyob fayllar saqlanadigan papka"
             )
 
+            use_hardlinks = st.checkbox(
+                "🔗 Hardlink ishlatish",
+                value=True,
+                help="Chiqish papkasi manba bilan bir diskda bo'lsa, audio fayllar nusxalanmasdan bog'lanadi"
+            )
+
             col_btn1, col_btn2 = st.columns(2)
 
             with col_btn1:
                 if st.button("📁 Fayllarni papkaga saqlash", type="primary"):
                     if output_folder:
                         with st.spinner("Fayllar nusxalanmoqda..."):
-                            report = create_output_package(unique_items, matched_files, output_folder)
+                            report = create_output_package(unique_items, matched_files, output_folder, use_hardlinks)
 
                             st.success(f"✅ Jarayon tugadi!")
 
@@ -342,34 +507,30 @@ def main():
             with col_btn2:
                 if st.button("📦 ZIP faylni yaratish"):
                     with st.spinner("ZIP fayl yaratilmoqda..."):
-                        # Vaqtinchalik papka
-                        temp_dir = tempfile.mkdtemp()
-
-                        # Fayllarni vaqtinchalik papkaga nusxalash
-                        report = create_output_package(unique_items, matched_files, temp_dir)
-
-                        # ZIP yaratish
-                        zip_path = os.path.join(temp_dir, "noyob_dataset.zip")
-                        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                            # Barcha fayllarni ZIP ga qo'shish
-                            for root, dirs, files in os.walk(temp_dir):
-                                for file in files:
-                                    if file != "noyob_dataset.zip":
-                                        file_path = os.path.join(root, file)
-                                        arcname = os.path.relpath(file_path, temp_dir)
-                                        zipf.write(file_path, arcname)
+                        # ZIP ni vaqtinchalik faylga to'g'ridan-to'g'ri yozish
+                        with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as tmp:
+                            zip_path = tmp.name
+                        report = create_zip_package(unique_items, matched_files, zip_path)
 
                         # ZIP ni yuklab olish
                         with open(zip_path, 'rb') as f:
-                            st.download_button(
-                                label="⬇️ ZIP faylni yuklab olish",
-                                data=f.read(),
-                                file_name="noyob_dataset.zip",
-                                mime="application/zip"
-                            )
+                            zip_bytes = f.read()
+                        os.remove(zip_path)
+
+                        st.download_button(
+                            label="⬇️ ZIP faylni yuklab olish",
+                            data=zip_bytes,
+                            file_name="noyob_dataset.zip",
+                            mime="application/zip"
+                        )
 
                         st.success(f"ZIP yaratildi: {report['nusxalangan_audio']} audio fayl")
 
+                        if report['nusxalash_xatolari']:
+                            st.warning("⚠️ Nusxalash xatolari:")
+                            for error in report['nusxalash_xatolari']:
+                                st.text(f"• {error}")
+
     else:
         # Boshlash ko'rsatmalari
         st.info("👈 Chapdan papka yo'lini kiriting va jarayonni boshlang")
@@ -1,43 +1,87 @@
 #!/usr/bin/env python3
 import argparse
 import csv
+import errno
 import json
 import logging
 import os
 import re
 import shutil
 import sys
+import threading
 import unicodedata
-from dataclasses import dataclass, field
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
+from dataclasses import dataclass
 from datetime import datetime
 from difflib import SequenceMatcher
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple, Any, Set, DefaultDict
-from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Any, Set
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to stdlib json
+    orjson = None
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:  # optional: falls back to difflib
+    fuzz = process = None
+
+try:
+    import xxhash
+except ImportError:  # optional: falls back to the builtin str hash (keys never leave the process)
+    xxhash = None
+
+try:
+    from datasketch import LeanMinHash, MinHash, MinHashLSH
+except ImportError:  # optional: without it every fuzzy insert scans all kept texts
+    LeanMinHash = MinHash = MinHashLSH = None
+
+LSH_NUM_PERM = 64
+SHINGLE_SIZE = 3
+
+OUTPUT_BUFFER_SIZE = 8 << 20  # 8 MiB buffer for the combined JSONL output
+REPORT_BUFFER_SIZE = 1 << 20
+REPORT_BATCH_ROWS = 4096  # report rows are handed to csv.writerows in batches of this size
+COPY_CHUNK_SIZE = 1 << 20  # copy_file_range request size / userspace fallback buffer
+COPY_WORKERS = min(32, (os.cpu_count() or 1) * 4)  # copies are I/O-bound
+PARSE_AHEAD_PER_WORKER = 2  # files parsed ahead of the serial dedupe loop, per worker process
+REPORT_FIELDS = ["action","reason","text_preview","json_path","audio_path","duration_ms","created_at","norm_key"]
 
 # ---------------------------
 # Helpers
 # ---------------------------
 
+_WS_RE = re.compile(r"\s+")
+_DT_MIN = datetime.min  # sort/compare stand-in for records without created_at
+_STRIP_CHARS = " \t\n\r\"'`.,;:!?-—–()[]{}"
+
+@lru_cache(maxsize=200_000)
 def normalize_text(text: str) -> str:
     """Normalize text for exact duplicate keys.
     - Unicode NFKC
     - lowercased
     - collapse whitespace
     - strip surrounding punctuation-like chars
+    Cached on the raw text: duplicate texts are exactly what this pipeline sees.
     """
     if text is None:
         return ""
-    t = unicodedata.normalize("NFKC", text)
-    t = t.casefold()
-    t = re.sub(r"\s+", " ", t).strip()
+    t = unicodedata.normalize("NFKC", text).casefold()
+    t = _WS_RE.sub(" ", t).strip()
     # strip common trailing/leading punctuation and quotes
-    t = t.strip(" \t\n\r\"'`.,;:!?-—–()[]{}")
-    return t
+    return t.strip(_STRIP_CHARS)
 
 def parse_datetime(s: Optional[str]) -> Optional[datetime]:
-    if not s:
+    if not s or not isinstance(s, str):
         return None
+    return _parse_datetime_cached(s)
+
+@lru_cache(maxsize=50_000)
+def _parse_datetime_cached(s: str) -> Optional[datetime]:
+    """Exports share timestamps a lot; datetimes are immutable so cached results are shared."""
     # try common formats (ISO preferred)
     try:
         return datetime.fromisoformat(s.replace("Z", "+00:00"))
@@ -54,8 +98,39 @@ def parse_datetime(s: Optional[str]) -> Optional[datetime]:
 
 def similar(a: str, b: str) -> float:
     """Quick similarity for fuzzy near-duplicates."""
+    if fuzz is not None:
+        return fuzz.ratio(a, b) / 100.0
     return SequenceMatcher(None, a, b).ratio()
 
+def json_loads(data: bytes) -> Any:
+    """Decode JSON from raw UTF-8 bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps_line(obj: Any) -> bytes:
+    """Encode one JSONL line as UTF-8 bytes, newline included."""
+    if orjson is not None:
+        return orjson.dumps(obj) + b"\n"
+    return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
+def lsh_jaccard_threshold(ratio_threshold: float) -> float:
+    """Shingle-Jaccard level that still recalls texts at the given edit ratio.
+
+    Every edit touches up to SHINGLE_SIZE shingles, so an edit ratio r maps
+    to roughly (1 - k) / (1 + k) Jaccard with k = SHINGLE_SIZE * (1 - r).
+    Candidates are confirmed with the real ratio afterwards.
+    """
+    k = SHINGLE_SIZE * (1.0 - ratio_threshold)
+    return min(max((1.0 - k) / (1.0 + k), 0.1), 0.99)
+
+def text_minhash(norm_text: str) -> "MinHash":
+    """MinHash over character shingles of a normalized text."""
+    mh = MinHash(num_perm=LSH_NUM_PERM)
+    n = max(len(norm_text) - SHINGLE_SIZE + 1, 1)
+    mh.update_batch([norm_text[i:i + SHINGLE_SIZE].encode("utf-8") for i in range(n)])
+    return mh
+
 def is_jsonl_file(path: Path) -> bool:
     return path.suffix.lower() in {".jsonl", ".ndjson"}
 
@@ -63,15 +138,14 @@ def load_json_items(path: Path) -> Iterable[Dict[str, Any]]:
     """Yield JSON objects from a .json (single or list) or .jsonl file."""
     try:
         if is_jsonl_file(path):
-            with path.open("r", encoding="utf-8") as f:
+            with path.open("rb") as f:
                 for line in f:
-                    line = line.strip()
-                    if not line:
+                    if not line.strip():
                         continue
-                    yield json.loads(line)
+                    yield json_loads(line)
         else:
-            with path.open("r", encoding="utf-8") as f:
-                obj = json.load(f)
+            with path.open("rb") as f:
+                obj = json_loads(f.read())
             if isinstance(obj, list):
                 for item in obj:
                     if isinstance(item, dict):
@@ -86,6 +160,55 @@ def load_json_items(path: Path) -> Iterable[Dict[str, Any]]:
 def ensure_dir(p: Path):
     p.mkdir(parents=True, exist_ok=True)
 
+_COPY_FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOTSUP, errno.EOPNOTSUPP, errno.EINVAL, errno.ENOSYS}
+_copy_local = threading.local()  # one fallback buffer per copy thread, allocated on first use
+
+def _copy_buffer() -> memoryview:
+    """This thread's reusable COPY_CHUNK_SIZE buffer for the readinto fallback."""
+    buf = getattr(_copy_local, "buf", None)
+    if buf is None:
+        buf = _copy_local.buf = memoryview(bytearray(COPY_CHUNK_SIZE))
+    return buf
+
+def fast_copy(src: Path, dst: Path):
+    """Copy ``src`` to ``dst`` in-kernel with os.copy_file_range where possible
+    (reflink on CoW filesystems, server-side copy on NFS), else a 1 MiB readinto
+    loop; then copy metadata like shutil.copy2.
+    """
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+        done = False
+        if hasattr(os, "copy_file_range"):
+            try:
+                while os.copy_file_range(in_fd, out_fd, COPY_CHUNK_SIZE):
+                    pass
+                done = True
+            except OSError as e:
+                if e.errno not in _COPY_FALLBACK_ERRNOS:
+                    raise
+                os.lseek(in_fd, 0, os.SEEK_SET)
+                os.lseek(out_fd, 0, os.SEEK_SET)
+                os.ftruncate(out_fd, 0)
+        if not done:
+            buf = _copy_buffer()
+            while True:
+                n = fsrc.readinto(buf)
+                if not n:
+                    break
+                fdst.write(buf[:n])
+    shutil.copystat(src, dst)
+
+@lru_cache(maxsize=None)
+def audio_names_in(root: Path, audio_exts: Tuple[str, ...]) -> frozenset:
+    """Names of audio files directly under ``root`` (listed once per process)."""
+    try:
+        with os.scandir(root) as entries:
+            return frozenset(
+                e.name for e in entries if e.name.endswith(audio_exts) and e.is_file()
+            )
+    except OSError:
+        return frozenset()
+
 def find_audio_for_item(
     item: Dict[str, Any],
     json_path: Path,
@@ -99,23 +222,18 @@ def find_audio_for_item(
       2) utt_id field if present
     Searches across audio_roots with allowed extensions.
     """
-    # 1) same stem as json
-    stem = json_path.stem
-    candidates = []
-    for root in audio_roots:
-        for ext in audio_exts:
-            p = root / f"{stem}{ext}"
-            if p.exists():
-                candidates.append(p)
-
-    # 2) utt_id as stem
+    # 1) same stem as json, 2) utt_id as stem
+    stems = [json_path.stem]
     utt = item.get("utt_id")
     if utt:
-        for root in audio_roots:
-            for ext in audio_exts:
-                p = root / f"{utt}{ext}"
-                if p.exists():
-                    candidates.append(p)
+        stems.append(utt)
+    candidates = [
+        root / name
+        for stem in stems
+        for root in audio_roots
+        for name in (f"{stem}{ext}" for ext in audio_exts)
+        if name in audio_names_in(root, audio_exts)
+    ]
 
     if candidates:
         # If multiple, pick the first by stable ordering
@@ -127,7 +245,7 @@ def find_audio_for_item(
 # Core data structures
 # ---------------------------
 
-@dataclass
+@dataclass(slots=True)
 class Record:
     text: str
     norm_text: str
@@ -137,8 +255,7 @@ class Record:
     duration_ms: Optional[int] = None
     created_at: Optional[datetime] = None
 
-@dataclass
-class KeptOrDropped:
+class KeptOrDropped(NamedTuple):
     action: str  # "kept" or "dropped"
     reason: str
     text_preview: str
@@ -152,20 +269,69 @@ class KeptOrDropped:
 # Deduper
 # ---------------------------
 
+def text_key(norm_text: str) -> int:
+    """64-bit key for a normalized text (exact_map is keyed by this, not the text)."""
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(norm_text.encode("utf-8"))
+    return hash(norm_text)
+
 class Deduper:
     def __init__(
         self,
         on_duplicate: str = "keep_first",
         fuzzy_threshold: float = 0.0,  # 0 disables fuzzy
+        report_path: Optional[Path] = None,  # decisions are streamed here as CSV rows
     ):
         assert on_duplicate in {"keep_first", "keep_longer", "keep_newer"}
         self.on_duplicate = on_duplicate
         self.fuzzy_threshold = fuzzy_threshold
-        self.exact_map: Dict[str, Record] = {}  # norm_text -> Record
-        # fuzzy buckets to reduce pairwise checks (prefix bucket)
-        self.buckets: DefaultDict[str, List[Record]] = defaultdict(list)
+        self.exact_map: Dict[int, Record] = {}  # text_key(norm_text) -> Record
+        # slots whose record was swapped for a near-duplicate keep their original key text here
+        self.moved_keys: Dict[int, str] = {}
+        # fuzzy index: insertion seq -> Record; LSH (when available) returns candidate seqs
+        self.fuzzy_records: Dict[int, Record] = {}
+        self.fuzzy_seq = 0
+        self.lsh = None
+        if fuzzy_threshold > 0.0 and MinHashLSH is not None:
+            self.lsh = MinHashLSH(
+                threshold=lsh_jaccard_threshold(fuzzy_threshold), num_perm=LSH_NUM_PERM
+            )
 
-        self.journal: List[KeptOrDropped] = []
+        self._report_f = None
+        self._report_w = None
+        self._report_rows: List[tuple] = []
+        if report_path is not None:
+            self._report_f = open(report_path, "w", newline="", encoding="utf-8",
+                                  buffering=REPORT_BUFFER_SIZE)
+            self._report_w = csv.writer(self._report_f)
+            self._report_w.writerow(REPORT_FIELDS)
+
+    def emit(self, row: KeptOrDropped):
+        """Write one decision to the report (nothing is kept in memory)."""
+        if self._report_w is None:
+            return
+        self._report_rows.append((
+            row.action,
+            row.reason,
+            row.text_preview,
+            row.json_path,
+            row.audio_path,
+            row.duration_ms if row.duration_ms is not None else "",
+            row.created_at if row.created_at else "",
+            row.key
+        ))
+        if len(self._report_rows) >= REPORT_BATCH_ROWS:
+            self._flush_report()
+
+    def _flush_report(self):
+        self._report_w.writerows(self._report_rows)
+        self._report_rows.clear()
+
+    def close(self):
+        if self._report_f is not None:
+            self._flush_report()
+            self._report_f.close()
+            self._report_f = self._report_w = None
 
     def decide(self, a: Record, b: Record) -> Tuple[Record, Record, str]:
         """Return (winner, loser, reason)."""
@@ -182,8 +348,8 @@ class Deduper:
                 reason = "duplicate (keep_longer: existing has longer or equal duration)"
                 return (a, b, reason)
         else:  # keep_newer
-            ta = a.created_at or datetime.min
-            tb = b.created_at or datetime.min
+            ta = a.created_at or _DT_MIN
+            tb = b.created_at or _DT_MIN
             if tb > ta:
                 reason = "duplicate (keep_newer: newer created_at)"
                 return (b, a, reason)
@@ -191,14 +357,61 @@ class Deduper:
                 reason = "duplicate (keep_newer: existing is newer or equal)"
                 return (a, b, reason)
 
-    def maybe_insert(self, rec: Record):
+    def exact_slot(self, key: str) -> int:
+        """Return the exact_map slot for ``key``: its own entry, or the free slot to use.
+
+        Hits are verified against the stored text; a 64-bit collision probes the next slot.
+        """
+        h = text_key(key)
+        while True:
+            rec = self.exact_map.get(h)
+            if rec is None or self.moved_keys.get(h, rec.norm_text) == key:
+                return h
+            h += 1
+
+    def fuzzy_add(self, rec: Record, mh: Optional["MinHash"]):
+        self.fuzzy_seq += 1
+        self.fuzzy_records[self.fuzzy_seq] = rec
+        if self.lsh is not None:
+            self.lsh.insert(self.fuzzy_seq, mh)
+
+    def fuzzy_remove(self, seq: int):
+        del self.fuzzy_records[seq]
+        if self.lsh is not None:
+            self.lsh.remove(seq)
+
+    def first_similar(self, key: str, mh: Optional["MinHash"]) -> Optional[Tuple[int, float]]:
+        """Return (seq, similarity) of the earliest kept text at or above the threshold."""
+        if self.lsh is not None:
+            seqs = sorted(self.lsh.query(mh))
+        else:
+            seqs = list(self.fuzzy_records)
+        texts = [self.fuzzy_records[seq].norm_text for seq in seqs]
+        if process is not None:
+            hits = process.extract(
+                key, texts, scorer=fuzz.ratio,
+                score_cutoff=self.fuzzy_threshold * 100, limit=None,
+            )
+            if not hits:
+                return None
+            _, score, index = min(hits, key=lambda h: h[2])
+            return seqs[index], score / 100.0
+        for seq, text in zip(seqs, texts):
+            sim = similar(key, text)
+            if sim >= self.fuzzy_threshold:
+                return seq, sim
+        return None
+
+    def maybe_insert(self, rec: Record, mh: Optional["MinHash"] = None):
+        """Insert one record; mh is its precomputed MinHash (computed here if missing)."""
         key = rec.norm_text
+        slot = self.exact_slot(key)
 
         # 1) Exact match first
-        if key in self.exact_map:
-            winner, loser, reason = self.decide(self.exact_map[key], rec)
-            self.exact_map[key] = winner
-            self.journal.append(
+        if slot in self.exact_map:
+            winner, loser, reason = self.decide(self.exact_map[slot], rec)
+            self.exact_map[slot] = winner
+            self.emit(
                 KeptOrDropped(
                     action="dropped",
                     reason=reason,
@@ -212,55 +425,59 @@ class Deduper:
             )
             return
 
-        # 2) If fuzzy enabled, check near-duplicates inside a bucket
+        # 2) If fuzzy enabled, check near-duplicates among LSH candidates
         if self.fuzzy_threshold > 0.0:
-            bucket_key = key[:16]  # small prefix bucket
-            for existing in self.buckets[bucket_key]:
-                sim = similar(key, existing.norm_text)
-                if sim >= self.fuzzy_threshold:
-                    winner, loser, reason = self.decide(existing, rec)
-                    if winner is not existing:
-                        # replace in exact map too (must move key!)
-                        if existing.norm_text in self.exact_map:
-                            self.exact_map[existing.norm_text] = winner
-                        else:
-                            # not inserted yet; insert winner under its key
-                            self.exact_map[winner.norm_text] = winner
-                        # update bucket: replace
-                        self.buckets[bucket_key].remove(existing)
-                        self.buckets[bucket_key].append(winner)
-                        self.journal.append(
-                            KeptOrDropped(
-                                action="dropped",
-                                reason=f"near-duplicate ({sim:.2f}) | {reason}",
-                                text_preview=rec.text[:80],
-                                json_path=str(rec.json_path),
-                                audio_path=str(rec.audio_path) if rec.audio_path else "",
-                                duration_ms=rec.duration_ms,
-                                created_at=rec.created_at.isoformat() if rec.created_at else None,
-                                key=key,
-                            )
-                        )
-                        return
+            if mh is None and self.lsh is not None:
+                mh = text_minhash(key)
+            hit = self.first_similar(key, mh)
+            if hit is not None:
+                seq, sim = hit
+                existing = self.fuzzy_records[seq]
+                winner, loser, reason = self.decide(existing, rec)
+                if winner is not existing:
+                    # replace in exact map too (must move key!)
+                    existing_slot = self.exact_slot(existing.norm_text)
+                    if existing_slot in self.exact_map:
+                        self.exact_map[existing_slot] = winner
+                        self.moved_keys.setdefault(existing_slot, existing.norm_text)
                     else:
-                        # drop new rec
-                        self.journal.append(
-                            KeptOrDropped(
-                                action="dropped",
-                                reason=f"near-duplicate ({sim:.2f}) | {reason}",
-                                text_preview=rec.text[:80],
-                                json_path=str(rec.json_path),
-                                audio_path=str(rec.audio_path) if rec.audio_path else "",
-                                duration_ms=rec.duration_ms,
-                                created_at=rec.created_at.isoformat() if rec.created_at else None,
-                                key=key,
-                            )
+                        # not inserted yet; insert winner under its key
+                        self.exact_map[slot] = winner
+                    # update fuzzy index: replace
+                    self.fuzzy_remove(seq)
+                    self.fuzzy_add(winner, mh)
+                    self.emit(
+                        KeptOrDropped(
+                            action="dropped",
+                            reason=f"near-duplicate ({sim:.2f}) | {reason}",
+                            text_preview=rec.text[:80],
+                            json_path=str(rec.json_path),
+                            audio_path=str(rec.audio_path) if rec.audio_path else "",
+                            duration_ms=rec.duration_ms,
+                            created_at=rec.created_at.isoformat() if rec.created_at else None,
+                            key=key,
                         )
-                        return
+                    )
+                    return
+                else:
+                    # drop new rec
+                    self.emit(
+                        KeptOrDropped(
+                            action="dropped",
+                            reason=f"near-duplicate ({sim:.2f}) | {reason}",
+                            text_preview=rec.text[:80],
+                            json_path=str(rec.json_path),
+                            audio_path=str(rec.audio_path) if rec.audio_path else "",
+                            duration_ms=rec.duration_ms,
+                            created_at=rec.created_at.isoformat() if rec.created_at else None,
+                            key=key,
+                        )
+                    )
+                    return
             # no near-dup found; insert
-            self.exact_map[key] = rec
-            self.buckets[bucket_key].append(rec)
-            self.journal.append(
+            self.exact_map[slot] = rec
+            self.fuzzy_add(rec, mh)
+            self.emit(
                 KeptOrDropped(
                     action="kept",
                     reason="unique (fuzzy enabled, no near-dup found)",
@@ -275,8 +492,8 @@ class Deduper:
             return
 
         # 3) Fuzzy disabled: insert as unique
-        self.exact_map[key] = rec
-        self.journal.append(
+        self.exact_map[slot] = rec
+        self.emit(
             KeptOrDropped(
                 action="kept",
                 reason="unique (exact)",
@@ -294,12 +511,101 @@ class Deduper:
 # ---------------------------
 
 def walk_files(roots: List[Path], exts: Tuple[str, ...]) -> Iterable[Path]:
-    seen: Set[Path] = set()
+    """Yield files under ``roots`` whose suffix is in ``exts``.
+
+    os.scandir walk in the same order as ``rglob("*")``: a directory's files,
+    then each subdirectory (symlinked directories are not followed).
+    """
+    ext_set = frozenset(e.lower() for e in exts)
+    seen: Set[str] = set()
     for root in roots:
-        for p in root.rglob("*"):
-            if p.is_file() and p.suffix.lower() in exts and p not in seen:
-                seen.add(p)
-                yield p
+        stack = [str(root)]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            subdirs = []
+            for entry in entries:
+                name = entry.name
+                i = name.rfind(".")
+                if 0 < i and name[i:].lower() in ext_set and entry.is_file():
+                    if entry.path not in seen:
+                        seen.add(entry.path)
+                        yield Path(entry.path)
+                elif entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+            stack.extend(reversed(subdirs))
+
+def parse_file(
+    jpath: Path,
+    audio_exts: Tuple[str, ...],
+    audio_roots: List[Path],
+    with_minhash: bool = False,
+) -> Tuple[List[Tuple[Record, Optional["MinHash"]]], int]:
+    """Load, normalize and resolve audio for every item of one JSON file (runs in a worker).
+
+    Returns (record, MinHash) pairs and the number of items skipped for having
+    no text, so the parent process can log them. The MinHash (a compact
+    LeanMinHash, None unless with_minhash) is computed here so the serial
+    dedupe loop only queries and inserts.
+    """
+    recs: List[Tuple[Record, Optional["MinHash"]]] = []
+    skipped = 0
+    roots = audio_roots if audio_roots else [jpath.parent]
+    for item in load_json_items(jpath):
+        item_get = item.get
+        text = item_get("text")
+        if not isinstance(text, str) or not text.strip():
+            skipped += 1
+            continue
+
+        norm = normalize_text(text)
+        duration_ms = None
+        d_raw = item_get("duration_ms")
+        if d_raw is not None:
+            try:
+                duration_ms = int(d_raw)
+            except (TypeError, ValueError, OverflowError):
+                duration_ms = None
+
+        created_at = parse_datetime(item_get("created_at") or item_get("date"))
+
+        audio_path = find_audio_for_item(
+            item=item,
+            json_path=jpath,
+            audio_exts=audio_exts,
+            audio_roots=roots,
+        )
+
+        rec = Record(
+            text=text,
+            norm_text=norm,
+            json_path=jpath,
+            audio_path=audio_path,
+            item=item,
+            duration_ms=duration_ms,
+            created_at=created_at,
+        )
+        recs.append((rec, LeanMinHash(text_minhash(norm)) if with_minhash else None))
+    return recs, skipped
+
+def iter_parsed(ex: ProcessPoolExecutor, parse, paths: List[Path], ahead: int):
+    """Yield (path, parse(path)) in file order with at most `ahead` files submitted at once.
+
+    Unlike ex.map, results cannot pile up in memory when the consumer is slower
+    than the workers.
+    """
+    pending = deque()
+    for path in paths:
+        pending.append((path, ex.submit(parse, path)))
+        if len(pending) >= ahead:
+            done_path, fut = pending.popleft()
+            yield done_path, fut.result()
+    while pending:
+        done_path, fut = pending.popleft()
+        yield done_path, fut.result()
 
 def main():
     parser = argparse.ArgumentParser(
@@ -364,7 +670,9 @@ def main():
     ensure_dir(out_audio)
     ensure_dir(out_json.parent)
 
-    deduper = Deduper(on_duplicate=args.on_duplicate, fuzzy_threshold=args.fuzzy)
+    deduper = Deduper(
+        on_duplicate=args.on_duplicate, fuzzy_threshold=args.fuzzy, report_path=Path(args.report)
+    )
 
     total_json_files = 0
     total_json_items = 0
@@ -375,82 +683,51 @@ def main():
     total_json_files = len(json_files)
     logging.info(f"Found {total_json_files} JSON files.")
 
-    # iterate and insert
-    for jpath in json_files:
-        for item in load_json_items(jpath):
-            text = item.get("text")
-            if not text or not str(text).strip():
-                logging.warning(f"Skipping item without text in {jpath}")
-                continue
-
-            norm = normalize_text(text)
-            duration_ms = None
-            if "duration_ms" in item:
-                try:
-                    duration_ms = int(item["duration_ms"])
-                except Exception:
-                    duration_ms = None
-
-            created_at = parse_datetime(item.get("created_at") or item.get("date"))
-
-            audio_path = find_audio_for_item(
-                item=item,
-                json_path=jpath,
-                audio_exts=audio_exts,
-                audio_roots=audio_roots if audio_roots else [jpath.parent],
-            )
-
-            rec = Record(
-                text=text,
-                norm_text=norm,
-                json_path=jpath,
-                audio_path=audio_path,
-                item=item,
-                duration_ms=duration_ms,
-                created_at=created_at,
-            )
-            deduper.maybe_insert(rec)
-            total_json_items += 1
+    # parse files in worker processes, insert serially (the Deduper is the only serial point)
+    parse = partial(parse_file, audio_exts=audio_exts, audio_roots=audio_roots,
+                    with_minhash=deduper.lsh is not None)
+    workers = os.cpu_count() or 1
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            for jpath, (recs, skipped) in iter_parsed(ex, parse, json_files, workers * PARSE_AHEAD_PER_WORKER):
+                if skipped:
+                    logging.warning(f"Skipping {skipped} item(s) without text in {jpath}")
+                for rec, mh in recs:
+                    deduper.maybe_insert(rec, mh)
+                total_json_items += len(recs)
+    finally:
+        deduper.close()  # flushes the streamed report
 
     logging.info(f"Processed {total_json_items} items. Unique texts: {len(deduper.exact_map)}")
 
     # Write combined JSONL and copy audios
     kept = list(deduper.exact_map.values())
-    kept.sort(key=lambda r: (r.created_at or datetime.min, r.json_path.name))
+    kept.sort(key=lambda r: (r.created_at or _DT_MIN, r.json_path.name))
 
+    # phase 1: stream the JSONL through one large buffer
+    with out_json.open("wb", buffering=OUTPUT_BUFFER_SIZE) as jf:
+        for r in kept:
+            jf.write(json_dumps_line(r.item))
+
+    # phase 2: plan the audio copies
     copied = 0
     missing_audio = 0
-    with out_json.open("w", encoding="utf-8") as jf:
-        for r in kept:
-            # write item
-            jf.write(json.dumps(r.item, ensure_ascii=False) + "\n")
-
-            # copy audio if available
-            if r.audio_path and r.audio_path.exists():
-                dst = out_audio / r.audio_path.name
-                if not dst.exists():
-                    shutil.copy2(r.audio_path, dst)
-                copied += 1
-            else:
-                missing_audio += 1
+    plan: List[Tuple[Path, Path]] = []
+    planned: Set[Path] = set()  # a destination name is copied once, by the first record using it
+    for r in kept:
+        if r.audio_path and r.audio_path.exists():
+            dst = out_audio / r.audio_path.name
+            if dst not in planned and not dst.exists():
+                planned.add(dst)
+                plan.append((r.audio_path, dst))
+            copied += 1
+        else:
+            missing_audio += 1
 
-    # Report
-    with open(args.report, "w", newline="", encoding="utf-8") as cf:
-        writer = csv.writer(cf)
-        writer.writerow(
-            ["action","reason","text_preview","json_path","audio_path","duration_ms","created_at","norm_key"]
-        )
-        for row in deduper.journal:
-            writer.writerow([
-                row.action,
-                row.reason,
-                row.text_preview,
-                row.json_path,
-                row.audio_path,
-                row.duration_ms if row.duration_ms is not None else "",
-                row.created_at if row.created_at else "",
-                row.key
-            ])
+    # phase 3: run the copies in parallel; consuming map() re-raises copy errors
+    with ThreadPoolExecutor(max_workers=COPY_WORKERS) as copy_pool:
+        for _ in copy_pool.map(lambda job: fast_copy(*job), plan):
+            pass
 
     logging.info(f"Done. Wrote {len(kept)} unique items to {out_json}")
     logging.info(f"Copied {copied} audio files to {out_audio}. Missing audio: {missing_audio}")
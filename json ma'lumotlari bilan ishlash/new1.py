@@ -1,82 +1,232 @@
 import streamlit as st
+import errno
+import io
 import json
 import os
 import shutil
 import pandas as pd
-from pathlib import Path
 import zipfile
-import tempfile
+import multiprocessing
+import secrets
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from collections import defaultdict, Counter
 
+try:
+    import orjson
+except ImportError:  # bo'lmasa standart json ishlatiladi
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # bo'lmasa katta fayllar ham butunlay o'qiladi
+    ijson = None
+
+try:
+    from datasketch import MinHash, MinHashLSH
+except ImportError:  # bo'lmasa har bir matn barcha vakillar bilan solishtiriladi
+    MinHash = MinHashLSH = None
+
+LSH_NUM_PERM = 128
+SHINGLE_SIZE = 3
+OUTPUT_BUFFER_SIZE = 1 << 20
+PARALLEL_LOAD_MIN_FILES = 4096  # spawn va qayta importlar ~1 s turadi; kamroq faylni ketma-ket o'qish tezroq
+STREAM_JSON_MIN_BYTES = 64 << 20  # bundan katta JSON massivlar ijson bilan oqimda o'qiladi
+COPY_CHUNK_SIZE = 1 << 20  # copy_file_range so'rovi / zaxira bufer hajmi
+COPY_WORKERS = min(32, (os.cpu_count() or 1) * 4)  # nusxalash I/O ga bog'liq
+LSH_RECALL_MARGIN = 0.6
+LSH_WEIGHTS = (0.1, 0.9)  # (false positive, false negative): o'tkazib yuborish qimmatroq
+AUDIO_EXTENSIONS = ('.wav', '.mp3', '.ogg', '.flac', '.m4a')
+AUDIO_MATCH_FIELDS = ('utt_id', 'id', 'file_id', 'filename')  # audio nomi shu tartibda qidiriladi
+
 
 def scan_folder_for_files(folder_path):
     """Papkadan JSON va audio fayllarni qidirish"""
-    json_files = []
-    audio_files = {}
-
     if not folder_path or not os.path.exists(folder_path):
-        return json_files, audio_files
+        return [], {}
 
-    folder = Path(folder_path)
+    # Papka tarkibi o'zgarsa mtime ham o'zgaradi, shuning uchun kesh kaliti shu
+    return _scan_folder_cached(folder_path, os.stat(folder_path).st_mtime_ns)
 
-    # JSON fayllarni qidirish
-    for json_file in folder.glob("*.json"):
-        json_files.append(str(json_file))
 
-    # Audio fayllarni qidirish va indekslash
-    audio_extensions = ['.wav', '.mp3', '.ogg', '.flac', '.m4a']
-    for ext in audio_extensions:
-        for audio_file in folder.glob(f"*{ext}"):
-            file_stem = audio_file.stem
-            audio_files[file_stem] = str(audio_file)
+@st.cache_data(show_spinner=False)
+def _scan_folder_cached(folder_path, mtime_ns):
+    """Papkani bitta os.scandir o'tishida JSON va audio fayllarga ajratish"""
+    json_files = []
+    # Kengaytmalar bo'yicha guruhlanadi: bir xil nomli audio bo'lsa,
+    # ro'yxatda keyinroq turgan kengaytma ustun keladi (avvalgi glob tartibi)
+    audio_by_ext = {ext: [] for ext in AUDIO_EXTENSIONS}
+
+    with os.scandir(folder_path) as it:
+        for entry in it:
+            name = entry.name
+            if name.endswith('.json'):
+                json_files.append(entry.path)
+                continue
+            stem, ext = os.path.splitext(name)
+            bucket = audio_by_ext.get(ext)
+            if bucket is not None:
+                bucket.append((stem, entry.path))
+
+    # Audio fayllarni indekslash
+    audio_files = {}
+    for ext in AUDIO_EXTENSIONS:
+        audio_files.update(audio_by_ext[ext])
 
     return json_files, audio_files
 
 
+def _load_one(file_path):
+    """Bitta faylni o'qish (ishchi jarayonda): (ma'lumot, None) yoki (None, xato matni)"""
+    try:
+        return read_json_items(file_path), None
+    except Exception as e:
+        return None, str(e)
+
+
 def load_all_json_files(json_file_paths):
-    """Barcha JSON fayllarni yuklash"""
+    """Barcha JSON fayllarni yuklash
+
+    orjson bo'lmasa va fayllar juda ko'p bo'lsa, dekodlash alohida jarayonlarda (spawn) bajariladi;
+    jarayonlar ishga tushmasa, odatiy ketma-ket o'qishga qaytiladi.
+    """
     all_data = []
     failed_files = []
 
-    for file_path in json_file_paths:
+    results = None
+    if orjson is None and len(json_file_paths) >= PARALLEL_LOAD_MIN_FILES:
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if isinstance(data, list):
-                    all_data.extend(data)
-                else:
-                    all_data.append(data)
-        except Exception as e:
-            failed_files.append((file_path, str(e)))
-            st.warning(f"Fayl o'qilmadi: {os.path.basename(file_path)} - {str(e)}")
+            with ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn')) as ex:
+                results = list(ex.map(_load_one, json_file_paths, chunksize=8))
+        except Exception:
+            results = None
+    if results is None:
+        results = map(_load_one, json_file_paths)
+
+    for file_path, (data, error) in zip(json_file_paths, results):
+        if error is not None:
+            failed_files.append((file_path, error))
+            st.warning(f"Fayl o'qilmadi: {os.path.basename(file_path)} - {error}")
+        elif isinstance(data, list):
+            all_data.extend(data)
+        else:
+            all_data.append(data)
 
     return all_data, failed_files
 
 
+def load_json_bytes(raw):
+    """JSON baytlarini o'qish (orjson bo'lsa u orqali)"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def read_json_items(file_path):
+    """JSON faylni o'qish: massiv bo'lsa elementlar ro'yxati, aks holda bitta obyekt
+
+    Katta massivlar ijson bilan oqimda o'qiladi, butun fayl matni xotirada saqlanmaydi.
+    """
+    if ijson is not None and os.path.getsize(file_path) > STREAM_JSON_MIN_BYTES:
+        with open(file_path, 'rb') as f:
+            head = f.read(4096).lstrip()
+            if head.startswith(b'['):
+                f.seek(0)
+                return list(ijson.items(f, 'item', use_float=True))
+
+    with open(file_path, 'rb') as f:
+        return load_json_bytes(f.read())
+
+
+def dump_json_pretty(data):
+    """JSON ni 2 bo'shliqli chekinish bilan UTF-8 baytlarga aylantirish (orjson bo'lsa u orqali)"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def lsh_jaccard_threshold(ratio_threshold):
+    """O'xshashlik chegarasiga mos shingle-Jaccard chegarasi (nomzodlarni yo'qotmaslik uchun pastroq)
+
+    Har bir tahrir SHINGLE_SIZE tagacha shingle'ni o'zgartiradi: k = SHINGLE_SIZE * (1 - r)
+    bo'lsa, Jaccard taxminan (1 - k) / (1 + k). LSH chegara atrofida ehtimoliy bo'lgani uchun
+    LSH_RECALL_MARGIN ga ko'paytiriladi; nomzodlar keyin SequenceMatcher bilan tekshiriladi.
+    """
+    k = SHINGLE_SIZE * (1.0 - ratio_threshold)
+    return min(max((1.0 - k) / (1.0 + k) * LSH_RECALL_MARGIN, 0.1), 0.9)
+
+
+def text_minhash(text):
+    """Matnning 3 belgili shingle'lari bo'yicha MinHash"""
+    mh = MinHash(num_perm=LSH_NUM_PERM)
+    n = max(len(text) - SHINGLE_SIZE + 1, 1)
+    mh.update_batch([text[i:i + SHINGLE_SIZE].encode('utf-8') for i in range(n)])
+    return mh
+
+
 def find_unique_and_duplicate_texts(json_data, similarity_threshold=0.95):
-    """Matnlarni unique va duplicate guruhlariga bo'lish"""
+    """Matnlarni unique va duplicate guruhlariga bo'lish
+
+    Nomzod vakillar MinHash LSH orqali olinadi (datasketch o'rnatilgan bo'lsa),
+    yakuniy qaror SequenceMatcher.ratio() bilan qabul qilinadi.
+    """
     from difflib import SequenceMatcher
 
     text_groups = defaultdict(list)
-    processed_texts = []
+    processed_texts = []  # vakil matnlar (kichik harflarda), qo'shilish tartibida
+    representatives = []  # processed_texts bilan bir xil tartibda asl matnlar
+    exact_index = {}  # kichik harfli matn -> vakil indeksi (aniq takrorlar o'xshashlik hisobisiz)
+
+    lsh = None
+    if MinHashLSH is not None:
+        lsh = MinHashLSH(threshold=lsh_jaccard_threshold(similarity_threshold), num_perm=LSH_NUM_PERM,
+                         weights=LSH_WEIGHTS)
 
     # Har bir elementni tekshirish
     for item in json_data:
         text = item.get('text', '').strip()
         if not text:
             continue
+        text_lower = text.lower()
+
+        # Aniq takror: shu matn vakil bo'lganida undan oldingi hech bir vakil mos kelmagan,
+        # demak birinchi mos vakil aynan o'zi
+        index = exact_index.get(text_lower)
+        if index is not None:
+            text_groups[representatives[index]].append(item)
+            continue
+
+        # O'xshashlik tekshiruvi: faqat LSH nomzodlari, eng birinchi qo'shilgan vakil ustun
+        mh = None
+        if lsh is not None:
+            mh = text_minhash(text_lower)
+            candidates = sorted(lsh.query(mh))
+        else:
+            candidates = range(len(processed_texts))
 
-        # O'xshashlik tekshiruvi
         found_group = False
-        for existing_text in processed_texts:
-            similarity = SequenceMatcher(None, text.lower(), existing_text.lower()).ratio()
+        text_len = len(text_lower)
+        for index in candidates:
+            candidate = processed_texts[index]
+            # ratio() <= 2*min(len)/(len1+len2) va <= quick_ratio(): chegaradan past bo'lsa ratio() hisoblanmaydi
+            candidate_len = len(candidate)
+            if 2.0 * min(text_len, candidate_len) / (text_len + candidate_len) < similarity_threshold:
+                continue
+            matcher = SequenceMatcher(None, text_lower, candidate)
+            if matcher.quick_ratio() < similarity_threshold:
+                continue
+            similarity = matcher.ratio()
             if similarity >= similarity_threshold:
-                text_groups[existing_text].append(item)
+                text_groups[representatives[index]].append(item)
                 found_group = True
                 break
 
         if not found_group:
-            processed_texts.append(text)
+            if lsh is not None:
+                lsh.insert(len(processed_texts), mh)
+            exact_index[text_lower] = len(processed_texts)
+            processed_texts.append(text_lower)
+            representatives.append(text)
             text_groups[text].append(item)
 
     # Unique va duplicate ajratish
@@ -103,61 +253,109 @@ def match_audio_files(unique_items, all_audio_files):
     """Audio fayllarni JSON bilan moslashtirish"""
     matched_files = []
     unmatched_files = []
+    matched_append = matched_files.append
+    unmatched_append = unmatched_files.append
 
     for item in unique_items:
-        audio_found = False
-
-        # Har xil maydonlar bo'yicha qidirish
-        search_fields = ['utt_id', 'id', 'file_id', 'filename']
-
-        for field in search_fields:
-            if field in item and item[field] in all_audio_files:
-                matched_files.append({
-                    'json_item': item,
-                    'audio_path': all_audio_files[item[field]],
-                    'match_method': field
-                })
-                audio_found = True
-                break
-
-        if not audio_found:
-            unmatched_files.append(item)
+        # Har xil maydonlar bo'yicha qidirish: birinchi mos kelgan maydon olinadi
+        field = next((f for f in AUDIO_MATCH_FIELDS
+                      if f in item and item[f] in all_audio_files), None)
+        if field is None:
+            unmatched_append(item)
+        else:
+            matched_append({
+                'json_item': item,
+                'audio_path': all_audio_files[item[field]],
+                'match_method': field
+            })
 
     return matched_files, unmatched_files
 
 
+_COPY_FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOTSUP, errno.EOPNOTSUPP, errno.EINVAL, errno.ENOSYS}
+_copy_local = threading.local()  # har bir nusxalash oqimi uchun bitta zaxira bufer
+
+
+def _copy_buffer():
+    """Joriy oqimning qayta ishlatiladigan 1 MiB buferi (birinchi chaqiruvda yaratiladi)"""
+    buf = getattr(_copy_local, 'buf', None)
+    if buf is None:
+        buf = _copy_local.buf = memoryview(bytearray(COPY_CHUNK_SIZE))
+    return buf
+
+
+def _copy_stream(fsrc, fdst):
+    """Ochiq fayllar orasida nusxalash: imkon bo'lsa yadro ichida os.copy_file_range
+    (CoW'da reflink), aks holda 1 MiB readinto sikli"""
+    in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+    if hasattr(os, 'copy_file_range'):
+        try:
+            while os.copy_file_range(in_fd, out_fd, COPY_CHUNK_SIZE):
+                pass
+            return
+        except OSError as e:
+            if e.errno not in _COPY_FALLBACK_ERRNOS:
+                raise
+            os.lseek(in_fd, 0, os.SEEK_SET)
+            os.lseek(out_fd, 0, os.SEEK_SET)
+            os.ftruncate(out_fd, 0)
+    buf = _copy_buffer()
+    while True:
+        n = fsrc.readinto(buf)
+        if not n:
+            break
+        fdst.write(buf[:n])
+
+
+def fast_copy(src, dst):
+    """Faylni nusxalash; so'ng shutil.copy2 kabi metadata nusxalanadi"""
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        _copy_stream(fsrc, fdst)
+    shutil.copystat(src, dst)
+
+
+def _reserve_unique_path(dst_path):
+    """Nomni O_EXCL bilan atomar band qilish; band bo'lsa tasodifiy qo'shimcha qo'shiladi.
+    (fd, yo'l) qaytaradi"""
+    base_name, ext = os.path.splitext(dst_path)
+    path = dst_path
+    while True:
+        try:
+            return os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666), path
+        except FileExistsError:
+            path = f"{base_name}_{secrets.token_hex(3)}{ext}"
+
+
 def create_output_package(unique_items, matched_files, output_folder):
     """Chiqish paketini yaratish"""
     os.makedirs(output_folder, exist_ok=True)
 
     json_output_path = os.path.join(output_folder, "noyob_matnlar.json")
-    with open(json_output_path, 'w', encoding='utf-8') as f:
-        json.dump(unique_items, f, ensure_ascii=False, indent=2)
+    with open(json_output_path, 'wb', buffering=OUTPUT_BUFFER_SIZE) as f:
+        f.write(dump_json_pretty(unique_items))
 
     audio_output_folder = os.path.join(output_folder, "audio_fayllar")
     os.makedirs(audio_output_folder, exist_ok=True)
 
-    copied_count = 0
-    copy_errors = []
-
-    for match in matched_files:
+    def copy_one(match):
+        src_path = match['audio_path']
+        filename = os.path.basename(src_path)
         try:
-            src_path = match['audio_path']
-            filename = os.path.basename(src_path)
-            dst_path = os.path.join(audio_output_folder, filename)
-
-            # Agar fayl allaqachon mavjud bo'lsa, noyob nom berish
-            counter = 1
-            base_name, ext = os.path.splitext(filename)
-            while os.path.exists(dst_path):
-                new_filename = f"{base_name}_{counter}{ext}"
-                dst_path = os.path.join(audio_output_folder, new_filename)
-                counter += 1
-
-            shutil.copy2(src_path, dst_path)
-            copied_count += 1
+            with open(src_path, 'rb') as fsrc:
+                # Agar fayl allaqachon mavjud bo'lsa, noyob nom beriladi
+                fd, dst_path = _reserve_unique_path(os.path.join(audio_output_folder, filename))
+                with os.fdopen(fd, 'wb') as fdst:
+                    _copy_stream(fsrc, fdst)
+            shutil.copystat(src_path, dst_path)
+            return None
         except Exception as e:
-            copy_errors.append(f"{filename}: {str(e)}")
+            return f"{filename}: {str(e)}"
+
+    with ThreadPoolExecutor(max_workers=COPY_WORKERS) as ex:
+        results = list(ex.map(copy_one, matched_files))
+
+    copy_errors = [error for error in results if error is not None]
+    copied_count = len(results) - len(copy_errors)
 
     report = {
         'umumiy_json': len(unique_items),
@@ -171,27 +369,74 @@ def create_output_package(unique_items, matched_files, output_folder):
     return report
 
 
+def create_zip_package(unique_items, matched_files):
+    """Chiqish paketini vaqtinchalik papkasiz to'g'ridan-to'g'ri ZIP ga yozish.
+    JSON siqiladi, audio (allaqachon siqilgan) ZIP_STORED bilan qo'shiladi.
+    (zip baytlari, hisobot) qaytaradi"""
+    buffer = io.BytesIO()
+    copy_errors = []
+    taken = set()
+    with zipfile.ZipFile(buffer, 'w', allowZip64=True) as zipf:
+        zipf.writestr("noyob_matnlar.json", dump_json_pretty(unique_items),
+                      compress_type=zipfile.ZIP_DEFLATED)
+
+        for match in matched_files:
+            src_path = match['audio_path']
+            filename = os.path.basename(src_path)
+            arcname = f"audio_fayllar/{filename}"
+            # Agar nom allaqachon band bo'lsa, noyob nom berish
+            base_name, ext = os.path.splitext(arcname)
+            while arcname in taken:
+                arcname = f"{base_name}_{secrets.token_hex(3)}{ext}"
+            try:
+                zipf.write(src_path, arcname, compress_type=zipfile.ZIP_STORED)
+                taken.add(arcname)
+            except Exception as e:
+                copy_errors.append(f"{filename}: {str(e)}")
+
+    report = {
+        'umumiy_json': len(unique_items),
+        'moslashgan_audio': len(matched_files),
+        'nusxalangan_audio': len(matched_files) - len(copy_errors),
+        'nusxalash_xatolari': copy_errors
+    }
+
+    return buffer.getvalue(), report
+
+
 def create_statistics_dataframe(unique_items):
     """Statistika uchun DataFrame yaratish"""
     if not unique_items:
         return pd.DataFrame()
 
-    stats_data = []
-    for item in unique_items:
-        stats_data.append({
-            'ID': item.get('utt_id', 'N/A'),
-            'Matn (qisqa)': item.get('text', '')[:50] + '...' if len(item.get('text', '')) > 50 else item.get('text',
-                                                                                                              ''),
-            'Davomiyligi (ms)': item.get('duration_ms', 'N/A'),
-            'So\'zlovchi ID': item.get('speaker_id', 'N/A'),
-            'Jins': item.get('gender', 'N/A'),
-            'Hudud': item.get('region', 'N/A'),
-            'Kategoriya': item.get('category', 'N/A'),
-            'Kayfiyat': item.get('sentiment', 'N/A'),
-            'Yaratilgan': item.get('created_at', 'N/A')[:10] if item.get('created_at') else 'N/A'
-        })
-
-    return pd.DataFrame(stats_data)
+    # Ustunlar bitta o'tishda yig'iladi (qator lug'atlari o'rniga), keyin transpozitsiya qilinadi
+    (ids, texts, durations, speakers, genders, regions,
+     categories, sentiments, created) = zip(*[
+        (item.get('utt_id', 'N/A'),
+         item.get('text', ''),
+         item.get('duration_ms', 'N/A'),
+         item.get('speaker_id', 'N/A'),
+         item.get('gender', 'N/A'),
+         item.get('region', 'N/A'),
+         item.get('category', 'N/A'),
+         item.get('sentiment', 'N/A'),
+         item.get('created_at') or 'N/A')
+        for item in unique_items
+    ])
+    texts = pd.Series(texts)
+    short_texts = texts.str.slice(0, 50)
+
+    return pd.DataFrame({
+        'ID': ids,
+        'Matn (qisqa)': short_texts.where(texts.str.len() <= 50, short_texts + '...'),
+        'Davomiyligi (ms)': durations,
+        'So\'zlovchi ID': speakers,
+        'Jins': genders,
+        'Hudud': regions,
+        'Kategoriya': categories,
+        'Kayfiyat': sentiments,
+        'Yaratilgan': pd.Series(created).str.slice(0, 10)
+    })
 
 
 def main():
@@ -259,6 +504,9 @@ def main():
                     st.session_state.last_folder_path = path
                     st.rerun()
 
+    # Shu rerun davomida skanerlangan papkalar: ro'yxat va tahlil bir xil natijadan foydalanadi
+    folder_scans = {}
+
     # Tanlangan papkalar ro'yxati
     if st.session_state.selected_folders:
         st.subheader("📋 Tanlangan Papkalar:")
@@ -268,6 +516,7 @@ def main():
 
             with col1:
                 json_files, audio_files = scan_folder_for_files(selected_folder)
+                folder_scans[selected_folder] = (json_files, audio_files)
                 st.write(f"**{i + 1}.** `{selected_folder}` - JSON: {len(json_files)}, Audio: {len(audio_files)}")
 
             with col2:
@@ -307,7 +556,7 @@ def main():
             all_audio_files = {}
 
             for folder in st.session_state.selected_folders:
-                json_files, audio_files = scan_folder_for_files(folder)
+                json_files, audio_files = folder_scans.get(folder) or scan_folder_for_files(folder)
                 all_json_files.extend(json_files)
                 all_audio_files.update(audio_files)  # Audio fayllarni birlashtirish
 
@@ -364,14 +613,12 @@ def main():
             with col_stat1:
                 st.subheader("📈 Kategoriya bo'yicha")
                 if unique_items:
-                    categories = [item.get('category', 'Noma\'lum') for item in unique_items]
-                    category_counts = Counter(categories)
+                    category_counts = Counter(item.get('category', 'Noma\'lum') for item in unique_items)
                     st.bar_chart(category_counts)
             with col_stat2:
                 st.subheader("👥 Jins bo'yicha")
                 if unique_items:
-                    genders = [item.get('gender', 'Noma\'lum') for item in unique_items]
-                    gender_counts = Counter(genders)
+                    gender_counts = Counter(item.get('gender', 'Noma\'lum') for item in unique_items)
                     st.bar_chart(gender_counts)
 
         with tab3:
@@ -416,25 +663,13 @@ def main():
             with col_btn2:
                 if st.button("📦 ZIP Dataset"):
                     with st.spinner("ZIP dataset yaratilmoqda..."):
-                        temp_dir = tempfile.mkdtemp()
-                        report = create_output_package(unique_items, matched_files, temp_dir)
-                        zip_path = os.path.join(temp_dir, "final_unique_dataset.zip")
-
-                        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                            for root, dirs, files in os.walk(temp_dir):
-                                for file in files:
-                                    if file != "final_unique_dataset.zip":
-                                        file_path = os.path.join(root, file)
-                                        arcname = os.path.relpath(file_path, temp_dir)
-                                        zipf.write(file_path, arcname)
-
-                        with open(zip_path, 'rb') as f:
-                            st.download_button(
-                                label="⬇️ Final Dataset ZIP yuklab olish",
-                                data=f.read(),
-                                file_name="final_unique_dataset.zip",
-                                mime="application/zip"
-                            )
+                        zip_bytes, report = create_zip_package(unique_items, matched_files)
+                        st.download_button(
+                            label="⬇️ Final Dataset ZIP yuklab olish",
+                            data=zip_bytes,
+                            file_name="final_unique_dataset.zip",
+                            mime="application/zip"
+                        )
                         st.success(f"✅ ZIP yaratildi: {report['nusxalangan_audio']} audio fayl")
 
     else:
@@ -1,7 +1,9 @@
 # streamlit_audio_manager.py
 import streamlit as st
+import atexit
 import json
 import os
+import weakref
 import hashlib
 from datetime import datetime
 from typing import Dict, List, Any, Tuple
@@ -9,6 +11,87 @@ from difflib import SequenceMatcher
 import re
 import pandas as pd
 from pathlib import Path
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:  # bo'lmasa standart json ishlatiladi
+    orjson = None
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:  # bo'lmasa SequenceMatcher ishlatiladi
+    fuzz = process = None
+
+JSON_READ_WORKERS = 8  # fayllarni oldindan o'qiydigan oqimlar soni
+
+# Qo'shish/yangilashlar jurnalga yoziladi; shuncha yozuvdan keyin to'liq snapshot saqlanadi
+JOURNAL_SNAPSHOT_EVERY = 1000
+JOURNAL_BUFFER = 1 << 16
+# Jurnal yozuvlaridagi text_hash algoritmi nomi (app.py ham shu jurnal formatidan foydalanadi)
+HASH_ALGO = "md5-8"
+
+
+def load_json_bytes(raw: bytes) -> Any:
+    """JSON baytlarini o'qish (orjson bo'lsa u orqali)"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def load_json_file(file_path: str) -> Any:
+    """JSON faylni baytlar sifatida o'qib ochish"""
+    with open(file_path, 'rb') as file:
+        return load_json_bytes(file.read())
+
+
+def dump_json_pretty(data: Any) -> bytes:
+    """JSON ni 2 bo'shliqli chekinish bilan UTF-8 baytlarga aylantirish (orjson bo'lsa u orqali)"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def dump_json_compact(data: Any) -> bytes:
+    """Ixcham (bo'shliqsiz, bitta qatorli) JSON baytlari"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+
+
+def _read_json_file(file_path: str) -> Tuple[Any, Exception]:
+    """load_json_file natijasi yoki xatosi: (record, None) / (None, xato)"""
+    try:
+        return load_json_file(file_path), None
+    except Exception as e:
+        return None, e
+
+
+def iter_json_files(file_paths: List[str], workers: int = JSON_READ_WORKERS):
+    """Fayllarni oqimlarda oldindan o'qib, asl tartibda (record, xato) juftliklarini berish.
+    Oldinda ko'pi bilan 2*workers ta fayl o'qiladi; bazaga yozish chaqiruvchining oqimida qoladi"""
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for file_path in file_paths:
+            pending.append(executor.submit(_read_json_file, file_path))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+# Jurnali bor managerlar; kuchsiz havola managerni (va butun bazani) xotirada ushlab qolmaydi
+_open_managers = weakref.WeakSet()
+
+
+def _flush_open_journals():
+    """Jarayon tugaganda jurnal buferidagi yozuvlar yo'qolmasligi uchun"""
+    for manager in list(_open_managers):
+        manager.flush_journal()
+
+
+atexit.register(_flush_open_journals)
 
 
 class SmartAudioDataManager:
@@ -20,7 +103,40 @@ class SmartAudioDataManager:
         """
         self.main_db_path = main_db_path
         self.similarity_threshold = similarity_threshold
-        self.main_database = self.load_main_database()
+        self._journal = None
+        self.main_database = self._replay_journal(self.load_main_database())
+        _open_managers.add(self)
+        self._mutation_version = 0  # har bir qo'shish/yangilashda oshadi (statistika keshi kaliti)
+        self._rebuild_indexes()
+
+    def _rebuild_indexes(self):
+        """Takrorlar va speaker statistikasi uchun indekslarni recordlardan bir marta qurish"""
+        records = self.main_database["records"]
+        self._text_hash_index: Dict[str, List[str]] = {}  # text hash -> record IDlar (qo'shilish tartibida)
+        # o'xshashlik qidiruvi keshi: matnli recordlar ID si va tozalangan matni parallel ro'yxatlarda
+        self._ids_list: List[str] = []
+        self._cleaned_list: List[str] = []
+        for record_id, record in records.items():
+            self._index_text(record_id, record)
+        # speaker_id -> recordlar soni
+        self._speaker_index = Counter(record.get("speaker_id", "unknown") for record in records.values())
+
+    def _index_text(self, record_id: str, record: Dict[str, Any]):
+        """Record matnini takrorlar indeksiga va o'xshashlik keshiga qo'shish.
+        Hash recordda "_text_hash" sifatida saqlanadi: bir marta hisoblanadi, eski bazalarda shu yerda to'ldiriladi"""
+        text = record.get("text", "")
+        if text:
+            text_hash = record.get("_text_hash")
+            if text_hash is None:
+                text_hash = record["_text_hash"] = self.create_text_hash(text)
+            self._text_hash_index.setdefault(text_hash, []).append(record_id)
+            self._ids_list.append(record_id)
+            self._cleaned_list.append(self.clean_text(text))
+
+    def _index_record(self, record_id: str, record: Dict[str, Any]):
+        """Yangi recordni indekslarga qo'shish"""
+        self._index_text(record_id, record)
+        self._speaker_index[record.get("speaker_id", "unknown")] += 1
 
     def clean_text(self, text: str) -> str:
         """Matnni taqqoslash uchun tozalash"""
@@ -49,15 +165,39 @@ class SmartAudioDataManager:
         return hashlib.md5(clean_text.encode('utf-8')).hexdigest()[:8]
 
     def find_similar_records(self, new_text: str) -> List[Tuple[str, Dict, float]]:
-        """O'xshash matnlarni topish"""
-        similar_records = []
-
-        for record_id, record in self.main_database["records"].items():
-            existing_text = record.get("text", "")
-            similarity = self.calculate_text_similarity(new_text, existing_text)
+        """O'xshash matnlarni topish (mavjud recordlar keshdagi tozalangan matn bilan solishtiriladi)"""
+        clean_new = self.clean_text(new_text)
+        if not clean_new:
+            return []
+
+        records = self.main_database["records"]
+        if process is not None:
+            # C++ darajasida bitta chaqiruvda barcha recordlar bilan solishtirish
+            matches = process.extract(
+                clean_new, self._cleaned_list, scorer=fuzz.ratio,
+                score_cutoff=self.similarity_threshold * 100, limit=None
+            )
+            matches.sort(key=lambda m: (-m[1], m[2]))
+            return [(self._ids_list[index], records[self._ids_list[index]], score / 100.0)
+                    for _, score, index in matches]
 
-            if similarity >= self.similarity_threshold:
-                similar_records.append((record_id, record, similarity))
+        similar_records = []
+        threshold = self.similarity_threshold
+        new_len = len(clean_new)
+        for record_id, clean_existing in zip(self._ids_list, self._cleaned_list):
+            if not clean_existing:
+                continue
+            # ratio() <= 2*min(len)/(len1+len2) va <= quick_ratio(): chegaradan past bo'lsa ratio() hisoblanmaydi
+            existing_len = len(clean_existing)
+            if 2.0 * min(new_len, existing_len) / (new_len + existing_len) < threshold:
+                continue
+            matcher = SequenceMatcher(None, clean_new, clean_existing)
+            if matcher.quick_ratio() < threshold:
+                continue
+            similarity = matcher.ratio()
+
+            if similarity >= threshold:
+                similar_records.append((record_id, records[record_id], similarity))
 
         similar_records.sort(key=lambda x: x[2], reverse=True)
         return similar_records
@@ -66,8 +206,8 @@ class SmartAudioDataManager:
         """Ma'lumotlar bazasini yuklash"""
         if os.path.exists(self.main_db_path):
             try:
-                with open(self.main_db_path, 'r', encoding='utf-8') as file:
-                    data = json.load(file)
+                with open(self.main_db_path, 'rb') as file:
+                    data = load_json_bytes(file.read())
                     if isinstance(data, list):
                         # Eski formatni yangi formatga o'tkazish
                         new_format = {
@@ -103,8 +243,89 @@ class SmartAudioDataManager:
         if data is None:
             data = self.main_database
 
-        with open(self.main_db_path, 'w', encoding='utf-8') as file:
-            json.dump(data, file, ensure_ascii=False, indent=2)
+        # Avval vaqtinchalik faylga yoziladi, keyin atomar almashtiriladi
+        tmp_path = f"{self.main_db_path}.tmp"
+        with open(tmp_path, 'wb') as file:
+            file.write(dump_json_pretty(data))
+        os.replace(tmp_path, self.main_db_path)
+
+        if hasattr(self, "main_database") and data is self.main_database:
+            self._reset_journal()
+
+    @property
+    def _journal_path(self) -> str:
+        return f"{self.main_db_path}.jsonl"
+
+    def _replay_journal(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Oxirgi snapshotdan keyin jurnalga yozilgan recordlarni bazaga qo'llash"""
+        self._journal_entries = 0
+        try:
+            with open(self._journal_path, 'rb') as file:
+                raw = file.read()
+        except OSError:
+            return data
+
+        valid_end = 0
+        for line in raw.splitlines(keepends=True):
+            try:
+                entry = load_json_bytes(line)
+            except ValueError:
+                # Oxirgi qator to'liq yozilmay qolgan bo'lishi mumkin
+                break
+            valid_end += len(line)
+            record_id, record = entry["id"], entry["record"]
+            # Jurnalni boshqa algoritm (yoki boshqa ilova) yozgan bo'lsa, hash qayta hisoblanadi
+            if entry.get("hash_algo") != HASH_ALGO and record.get("text"):
+                record["text_hash"] = self.create_text_hash(record["text"])
+            if record_id not in data["records"]:
+                data["metadata"]["total_records"] += 1
+                text_hash = record.get("text_hash")
+                if text_hash:
+                    data["text_hashes"].setdefault(text_hash, []).append(record_id)
+            data["records"][record_id] = record
+            data["metadata"]["last_updated"] = entry.get("at", data["metadata"].get("last_updated"))
+            self._journal_entries += 1
+
+        if valid_end < len(raw) or not raw.endswith(b"\n"):
+            # Uzilgan qatorni kesib tashlash: aks holda keyingi yozuv unga qo'shilib, o'qilmay qoladi
+            with open(self._journal_path, 'r+b') as file:
+                file.truncate(valid_end)
+                if valid_end and not raw[:valid_end].endswith(b"\n"):
+                    file.seek(valid_end)
+                    file.write(b"\n")
+
+        return data
+
+    def _journal_record(self, record_id: str):
+        """Qo'shilgan yoki yangilangan recordni jurnal oxiriga yozish (butun bazani qayta yozmasdan)"""
+        if self._journal is None:
+            self._journal = open(self._journal_path, 'ab', buffering=JOURNAL_BUFFER)
+        entry = {"id": record_id, "record": self.main_database["records"][record_id],
+                 "at": datetime.now().isoformat(), "hash_algo": HASH_ALGO}
+        self._journal.write(dump_json_compact(entry) + b"\n")
+        self._journal_entries += 1
+
+        if self._journal_entries >= JOURNAL_SNAPSHOT_EVERY:
+            self.save_main_database()
+
+    def save_if_needed(self):
+        """Jurnalda snapshotga tushmagan o'zgarishlar bo'lsa, to'liq bazani saqlash"""
+        if self._journal_entries:
+            self.save_main_database()
+
+    def flush_journal(self):
+        """Jurnal buferini diskka yozish"""
+        if self._journal is not None:
+            self._journal.flush()
+
+    def _reset_journal(self):
+        """Snapshot saqlangandan keyin jurnalni tozalash"""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if os.path.exists(self._journal_path):
+            os.remove(self._journal_path)
+        self._journal_entries = 0
 
     def generate_unique_id(self, record: Dict[str, Any], filename: str) -> str:
         """ID yaratish"""
@@ -127,11 +348,17 @@ class SmartAudioDataManager:
         Takroriy tekshiruv bilan record qo'shish
         action_on_duplicate: 'ask', 'skip', 'add_anyway', 'update_existing'
         """
+        record, error = _read_json_file(file_path)
+        return self.add_record_from_dict(record, os.path.basename(file_path), action_on_duplicate, error)
+
+    def add_record_from_dict(self, new_record: Dict[str, Any], filename: str,
+                             action_on_duplicate: str = "ask",
+                             read_error: Exception = None) -> Dict[str, Any]:
+        """Allaqachon o'qilgan record uchun add_record_with_duplicate_check (fayl qayta o'qilmaydi)"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                new_record = json.load(file)
+            if read_error is not None:
+                raise read_error
 
-            filename = os.path.basename(file_path)
             new_text = new_record.get("text", "")
 
             if not new_text:
@@ -175,6 +402,8 @@ class SmartAudioDataManager:
 
                     existing_record["updated_at"] = datetime.now().isoformat()
                     existing_record["source_files"] = existing_record.get("source_files", []) + [filename]
+                    self._mutation_version += 1
+                    self._journal_record(existing_id)
 
                     result["status"] = "updated"
                     result["message"] = f"Mavjud record yangilandi: {existing_id}"
@@ -194,9 +423,11 @@ class SmartAudioDataManager:
             new_record["utt_id"] = unique_id
             new_record["source_file"] = filename
             new_record["added_at"] = datetime.now().isoformat()
-            new_record["text_hash"] = self.create_text_hash(new_text)
+            new_record["text_hash"] = new_record["_text_hash"] = self.create_text_hash(new_text)
 
             self.main_database["records"][unique_id] = new_record
+            self._index_record(unique_id, new_record)
+            self._mutation_version += 1
             self.main_database["metadata"]["total_records"] += 1
             self.main_database["metadata"]["last_updated"] = datetime.now().isoformat()
 
@@ -204,10 +435,12 @@ class SmartAudioDataManager:
             if text_hash not in self.main_database["text_hashes"]:
                 self.main_database["text_hashes"][text_hash] = []
             self.main_database["text_hashes"][text_hash].append(unique_id)
+            self._journal_record(unique_id)
 
             result["status"] = "added"
             result["message"] = f"Yangi record qo'shildi: {unique_id}"
             result["new_id"] = unique_id
+            result["speaker_id"] = new_record.get("speaker_id", "unknown")
 
             return result
 
@@ -215,7 +448,7 @@ class SmartAudioDataManager:
             return {
                 "status": "error",
                 "message": f"Xatolik: {str(e)}",
-                "filename": os.path.basename(file_path)
+                "filename": filename
             }
 
     def batch_process_folder(self, folder_path: str,
@@ -238,23 +471,16 @@ class SmartAudioDataManager:
         if not json_files:
             return {"error": "JSON fayllar topilmadi"}
 
-        for filename in json_files:
-            file_path = os.path.join(folder_path, filename)
-            result = self.add_record_with_duplicate_check(file_path, action_on_duplicate)
+        file_paths = [os.path.join(folder_path, filename) for filename in json_files]
+        for filename, (record, error) in zip(json_files, iter_json_files(file_paths)):
+            result = self.add_record_from_dict(record, filename, action_on_duplicate, error)
             results["details"].append(result)
 
             if result["status"] == "added":
                 results["added"] += 1
-                # Speaker statistikasini yangilash
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as file:
-                        record = json.load(file)
-                        speaker_id = record.get("speaker_id", "unknown")
-                        if speaker_id not in results["speaker_stats"]:
-                            results["speaker_stats"][speaker_id] = 0
-                        results["speaker_stats"][speaker_id] += 1
-                except:
-                    pass
+                # Speaker statistikasini yangilash (faylni qayta o'qimasdan, natijadan)
+                speaker_id = result["speaker_id"]
+                results["speaker_stats"][speaker_id] = results["speaker_stats"].get(speaker_id, 0) + 1
             elif result["status"] == "skipped":
                 results["skipped"] += 1
             elif result["status"] == "updated":
@@ -266,40 +492,15 @@ class SmartAudioDataManager:
 
     def find_all_duplicates(self) -> Dict[str, List[str]]:
         """Barcha takroriy matnlarni topish - to'g'rilangan"""
-        text_groups = {}
-
-        for record_id, record in self.main_database["records"].items():
-            text = record.get("text", "")
-            text_hash = self.create_text_hash(text)  # Hash asosida guruhlaymiz
-
-            if text_hash and text:
-                if text_hash not in text_groups:
-                    text_groups[text_hash] = {
-                        "text": self.clean_text(text),
-                        "original_text": text,
-                        "records": []
-                    }
-                text_groups[text_hash]["records"].append(record_id)
+        records = self.main_database["records"]
 
-        # Faqat 2 va undan ko'p yozuvga ega guruhlarni qaytarish
-        duplicates = {}
-        for text_hash, group_info in text_groups.items():
-            if len(group_info["records"]) > 1:
-                duplicates[group_info["original_text"]] = group_info["records"]
-
-        return duplicates
+        # Faqat 2 va undan ko'p yozuvga ega guruhlarni qaytarish (kalit - guruhdagi birinchi asl matn)
+        return {records[ids[0]].get("text", ""): list(ids)
+                for ids in self._text_hash_index.values() if len(ids) > 1}
 
     def get_speaker_statistics(self) -> Dict[str, int]:
         """Speaker ID bo'yicha statistika"""
-        speaker_stats = {}
-
-        for record in self.main_database["records"].values():
-            speaker_id = record.get("speaker_id", "unknown")
-            if speaker_id not in speaker_stats:
-                speaker_stats[speaker_id] = 0
-            speaker_stats[speaker_id] += 1
-
-        return speaker_stats
+        return dict(self._speaker_index)
 
     def get_duplicate_statistics(self) -> Dict[str, Any]:
         """Takroriy matnlar statistikasi"""
@@ -319,6 +520,30 @@ class SmartAudioDataManager:
         }
 
 
+def stats_cache_key(manager: SmartAudioDataManager) -> Tuple:
+    """Statistika keshi kaliti: baza o'zgarganda (qo'shish/yangilash) yangilanadi"""
+    return manager.main_db_path, id(manager), manager._mutation_version
+
+
+@st.cache_data(max_entries=4)
+def cached_duplicate_statistics(_manager: SmartAudioDataManager, cache_key: Tuple) -> Dict[str, Any]:
+    """get_duplicate_statistics natijasini Streamlit qayta ishga tushishlari orasida saqlash"""
+    return _manager.get_duplicate_statistics()
+
+
+@st.cache_data(max_entries=4)
+def cached_all_duplicates(_manager: SmartAudioDataManager, cache_key: Tuple) -> Dict[str, List[str]]:
+    """find_all_duplicates natijasini Streamlit qayta ishga tushishlari orasida saqlash"""
+    return _manager.find_all_duplicates()
+
+
+def save_current_manager():
+    """Sozlamalar o'zgarib manager almashtirilishidan oldin eski managerni saqlash"""
+    manager = st.session_state.get('manager')
+    if manager is not None:
+        manager.save_if_needed()
+
+
 def get_folder_paths():
     """Tizimdan papka yo'llarini olish"""
     if os.name == 'nt':  # Windows
@@ -361,13 +586,15 @@ def main():
             max_value=1.0,
             value=0.85,
             step=0.05,
-            help="Matnlar o'xshashligini belgilash chegarasi"
+            help="Matnlar o'xshashligini belgilash chegarasi",
+            on_change=save_current_manager
         )
 
         db_file = st.text_input(
             "Ma'lumotlar bazasi fayli",
             value="main_audio_database.json",
-            help="JSON ma'lumotlar bazasi fayl nomi"
+            help="JSON ma'lumotlar bazasi fayl nomi",
+            on_change=save_current_manager
         )
 
     # Manager obyektini yaratish yoki yangilash
@@ -475,29 +702,23 @@ def main():
                         results = {"added": 0, "skipped": 0, "updated": 0, "errors": 0, "details": [],
                                    "speaker_stats": {}}
 
-                        for i, filename in enumerate(json_files):
-                            file_path = os.path.join(folder_path, filename)
-
+                        # Fayllar oqimlarda oldindan o'qiladi, bazaga qo'shish shu oqimda ketma-ket bajariladi
+                        file_paths = [os.path.join(folder_path, filename) for filename in json_files]
+                        prefetched = iter_json_files(file_paths)
+                        for i, (filename, (record, error)) in enumerate(zip(json_files, prefetched)):
                             # Progress yangilash
                             progress = (i + 1) / len(json_files)
                             progress_bar.progress(progress)
                             status_text.text(f"Qayta ishlanmoqda: {filename} ({i + 1}/{len(json_files)})")
 
-                            result = manager.add_record_with_duplicate_check(file_path, duplicate_action)
+                            result = manager.add_record_from_dict(record, filename, duplicate_action, error)
                             results["details"].append(result)
 
                             if result["status"] == "added":
                                 results["added"] += 1
-                                # Speaker statistikasini yangilash
-                                try:
-                                    with open(file_path, 'r', encoding='utf-8') as file:
-                                        record = json.load(file)
-                                        speaker_id = record.get("speaker_id", "unknown")
-                                        if speaker_id not in results["speaker_stats"]:
-                                            results["speaker_stats"][speaker_id] = 0
-                                        results["speaker_stats"][speaker_id] += 1
-                                except:
-                                    pass
+                                # Speaker statistikasini yangilash (faylni qayta o'qimasdan, natijadan)
+                                speaker_id = result["speaker_id"]
+                                results["speaker_stats"][speaker_id] = results["speaker_stats"].get(speaker_id, 0) + 1
                             elif result["status"] == "skipped":
                                 results["skipped"] += 1
                             elif result["status"] == "updated":
@@ -505,8 +726,8 @@ def main():
                             else:
                                 results["errors"] += 1
 
-                        # Ma'lumotlarni saqlash
-                        manager.save_main_database()
+                        # O'zgarishlar jurnalga yozilgan; to'liq snapshot "Saqlash" tugmasi bilan
+                        manager.flush_journal()
 
                         # Natijalarni ko'rsatish
                         with results_container:
@@ -550,8 +771,8 @@ def main():
 
             # Joriy faylni tekshirish
             try:
-                with open(file_path, 'r', encoding='utf-8') as file:
-                    record = json.load(file)
+                with open(file_path, 'rb') as file:
+                    record = load_json_bytes(file.read())
                     new_text = record.get("text", "")
                     similar_records = manager.find_similar_records(new_text)
 
@@ -572,7 +793,7 @@ def main():
                                 result = manager.add_record_with_duplicate_check(file_path, "add_anyway")
                                 st.session_state.batch_results["added"] += 1
                                 st.session_state.current_file_index += 1
-                                manager.save_main_database()
+                                manager.flush_journal()
                                 st.rerun()
 
                         with col2:
@@ -586,7 +807,7 @@ def main():
                                 result = manager.add_record_with_duplicate_check(file_path, "update_existing")
                                 st.session_state.batch_results["updated"] += 1
                                 st.session_state.current_file_index += 1
-                                manager.save_main_database()
+                                manager.flush_journal()
                                 st.rerun()
 
                         with col4:
@@ -598,7 +819,7 @@ def main():
                         result = manager.add_record_with_duplicate_check(file_path, "add_anyway")
                         st.session_state.batch_results["added"] += 1
                         st.session_state.current_file_index += 1
-                        manager.save_main_database()
+                        manager.flush_journal()
                         st.rerun()
 
             except Exception as e:
@@ -626,7 +847,7 @@ def main():
     with tab2:
         st.header("📊 Ma'lumotlar Statistikasi")
 
-        stats = manager.get_duplicate_statistics()
+        stats = cached_duplicate_statistics(manager, stats_cache_key(manager))
 
         # Asosiy metrikalar
         col1, col2, col3, col4 = st.columns(4)
@@ -681,7 +902,7 @@ def main():
     with tab3:
         st.header("🔍 Takroriy Matnlar")
 
-        duplicates = manager.find_all_duplicates()
+        duplicates = cached_all_duplicates(manager, stats_cache_key(manager))
 
         if duplicates:
             st.write(f"Topilgan takroriy guruhlar: **{len(duplicates)}**")
@@ -713,7 +934,9 @@ def main():
 
             # Ma'lumotlar bazasini yuklab olish
             if st.button("Bazani Yuklab Olish"):
-                with open(manager.main_db_path, 'r', encoding='utf-8') as f:
+                # Jurnaldagi o'zgarishlar ham faylga tushishi uchun avval snapshot saqlanadi
+                manager.save_main_database()
+                with open(manager.main_db_path, 'rb') as f:
                     st.download_button(
                         label="JSON Faylni Yuklab Olish",
                         data=f.read(),
@@ -2,6 +2,7 @@ import streamlit as st
 import json
 import os
 import hashlib
+import functools
 from datetime import datetime
 from typing import Dict, List, Any, Tuple
 from difflib import SequenceMatcher
@@ -10,6 +11,30 @@ import pandas as pd
 import shutil
 from pathlib import Path
 
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:
+    fuzz = process = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# clean_text uchun: bo'shliqlar bitta ifoda bilan, tinish belgilari str.translate bilan
+_WS_RE = re.compile(r'\s+')
+_PUNCT_TABLE = str.maketrans('', '', '.,!?;:"„«»')
+
+# text_hash algoritmi: bazadagi metadata["hash_algo"] (yo'q bo'lsa md5) bilan mos kelmasa, hashlar qayta hisoblanadi.
+# "-8" qo'shimchasi: hash 8 belgigacha qisqartiriladi (app.py to'liq hashidan farqlash uchun)
+HASH_ALGO = "xxh3_64-8" if xxhash is not None else "md5-8"
+
+
+@functools.lru_cache(maxsize=100_000)
+def _clean_text(text: str) -> str:
+    """clean_text natijasi matn bo'yicha keshlanadi (bir xil matnlar qayta-qayta tozalanmaydi)"""
+    return _WS_RE.sub(' ', text.lower().strip()).translate(_PUNCT_TABLE)
+
 
 class SmartAudioDataManager:
     def __init__(self, main_db_path: str = "main_audio_database.json",
@@ -21,6 +46,34 @@ class SmartAudioDataManager:
         self.main_db_path = main_db_path
         self.similarity_threshold = similarity_threshold
         self.main_database = self.load_main_database()
+        self._rebuild_text_index()
+        if self.main_database["metadata"].get("hash_algo", "md5-8") != HASH_ALGO:
+            self._rehash_records()
+
+    def _rebuild_text_index(self):
+        """Tozalangan matnlar keshi: record ID va tozalangan matn parallel ro'yxatlarda"""
+        self._ids_list: List[str] = []
+        self._cleaned_list: List[str] = []
+        for record_id, record in self.main_database["records"].items():
+            self._index_record(record_id, record)
+
+    def _index_record(self, record_id: str, record: Dict[str, Any]):
+        """Recordni o'xshashlik qidiruvi keshiga qo'shish"""
+        text = record.get("text", "")
+        self._ids_list.append(record_id)
+        self._cleaned_list.append(self.clean_text(text) if isinstance(text, str) else "")
+
+    def _rehash_records(self):
+        """Eski algoritmdagi text_hash qiymatlarini joriy algoritm bilan qayta hisoblash"""
+        text_hashes = {}
+        for record_id, record in self.main_database["records"].items():
+            if "text_hash" not in record:
+                continue
+            text_hash = self.create_text_hash(record.get("text", ""))
+            record["text_hash"] = text_hash
+            text_hashes.setdefault(text_hash, []).append(record_id)
+        self.main_database["text_hashes"] = text_hashes
+        self.main_database["metadata"]["hash_algo"] = HASH_ALGO
 
     def add_record_streamlit(self, new_record: dict, filename: str,
                              action_on_duplicate: str = "ask", folder_path: str = None) -> Dict[str, Any]:
@@ -93,6 +146,7 @@ class SmartAudioDataManager:
             new_record["text_hash"] = self.create_text_hash(new_text)
 
             self.main_database["records"][unique_id] = new_record
+            self._index_record(unique_id, new_record)
             self.main_database["metadata"]["total_records"] += 1
             self.main_database["metadata"]["last_updated"] = datetime.now().isoformat()
 
@@ -631,11 +685,7 @@ class SmartAudioDataManager:
         if not text:
             return ""
 
-        text = text.lower().strip()
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'[.,!?;:"""''„"«»]', '', text)
-
-        return text
+        return _clean_text(text)
 
     def calculate_text_similarity(self, text1: str, text2: str) -> float:
         """Ikki matn orasidagi o'xshashlikni hisoblash"""
@@ -648,20 +698,46 @@ class SmartAudioDataManager:
         return similarity
 
     def create_text_hash(self, text: str) -> str:
-        """Matn uchun hash yaratish"""
+        """Matn uchun hash yaratish (kriptografik kuch shart emas, faqat kalit sifatida)"""
         clean_text = self.clean_text(text)
+        if xxhash is not None:
+            return xxhash.xxh3_64_hexdigest(clean_text.encode('utf-8'))[:8]
         return hashlib.md5(clean_text.encode('utf-8')).hexdigest()[:8]
 
     def find_similar_records(self, new_text: str) -> List[Tuple[str, Dict, float]]:
-        """O'xshash matnlarni topish"""
-        similar_records = []
+        """O'xshash matnlarni topish (mavjud recordlar keshdagi tozalangan matn bilan solishtiriladi)"""
+        clean_new = self.clean_text(new_text)
+        if not clean_new:
+            return []
 
-        for record_id, record in self.main_database["records"].items():
-            existing_text = record.get("text", "")
-            similarity = self.calculate_text_similarity(new_text, existing_text)
+        records = self.main_database["records"]
+        if process is not None:
+            # C++ darajasida bitta chaqiruvda barcha recordlar bilan solishtirish
+            matches = process.extract(
+                clean_new, self._cleaned_list, scorer=fuzz.ratio,
+                score_cutoff=self.similarity_threshold * 100, limit=None
+            )
+            matches.sort(key=lambda m: (-m[1], m[2]))
+            return [(self._ids_list[index], records[self._ids_list[index]], score / 100.0)
+                    for _, score, index in matches]
+
+        similar_records = []
+        threshold = self.similarity_threshold
+        new_len = len(clean_new)
+        for record_id, clean_existing in zip(self._ids_list, self._cleaned_list):
+            if not clean_existing:
+                continue
+            # ratio() <= 2*min(len)/(len1+len2) va <= quick_ratio(): chegaradan past bo'lsa ratio() hisoblanmaydi
+            existing_len = len(clean_existing)
+            if 2.0 * min(new_len, existing_len) / (new_len + existing_len) < threshold:
+                continue
+            matcher = SequenceMatcher(None, clean_new, clean_existing)
+            if matcher.quick_ratio() < threshold:
+                continue
+            similarity = matcher.ratio()
 
-            if similarity >= self.similarity_threshold:
-                similar_records.append((record_id, record, similarity))
+            if similarity >= threshold:
+                similar_records.append((record_id, records[record_id], similarity))
 
         similar_records.sort(key=lambda x: x[2], reverse=True)
         return similar_records
@@ -678,7 +754,8 @@ class SmartAudioDataManager:
                                 "total_records": len(data),
                                 "last_updated": datetime.now().isoformat(),
                                 "version": "2.0",
-                                "duplicate_policy": "detect_and_mark"
+                                "duplicate_policy": "detect_and_mark",
+                                "hash_algo": HASH_ALGO
                             },
                             "records": {item.get("utt_id", f"record_{i}"): item
                                         for i, item in enumerate(data)},
@@ -695,7 +772,8 @@ class SmartAudioDataManager:
                 "total_records": 0,
                 "last_updated": datetime.now().isoformat(),
                 "version": "2.0",
-                "duplicate_policy": "detect_and_mark"
+                "duplicate_policy": "detect_and_mark",
+                "hash_algo": HASH_ALGO
             },
             "records": {},
             "text_hashes": {}
@@ -793,6 +871,7 @@ class SmartAudioDataManager:
             new_record["text_hash"] = self.create_text_hash(new_text)
 
             self.main_database["records"][unique_id] = new_record
+            self._index_record(unique_id, new_record)
             self.main_database["metadata"]["total_records"] += 1
             self.main_database["metadata"]["last_updated"] = datetime.now().isoformat()
 